@@ -0,0 +1,139 @@
+import csv
+import re
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from main import AnalyzeSet, DataSet, Vacancy, VacancyTable
+
+
+def old_change_string(s: str):
+    """Прежняя версия DataSet.change_string: некомпилированное выражение для каждого поля строки
+    Args:
+        s (str): Строка для обработки
+    Returns:
+        (str): Строка без html тэгов, лишних пробелов и переносов
+    """
+    s = s.replace('\n', ';;')
+    return ' '.join(re.sub("<[^>]*>", "", s).split())
+
+
+def old_reader_to_rows(vacancy: list, file):
+    """Прежняя версия DataSet.reader_to_rows, которая очищала все поля строки
+    Args:
+        vacancy (list): Названия столбцов таблицы
+        file: Итерируемый объект строк таблицы в виде списков
+    Returns (generator): Генератор словарей
+    """
+    for x in file:
+        if len([value for value in x if value]) == len(vacancy):
+            yield dict(zip(vacancy, [old_change_string(s) for s in x if s]))
+
+
+def rows_per_second(reader_to_rows, file_name: str, repeat=3):
+    """Замеряет скорость чтения и очистки строк файла, берётся лучший результат из нескольких запусков
+    Args:
+        reader_to_rows: Функция, преобразующая строки csv в словари
+        file_name (str): Имя файла
+        repeat (int): Количество запусков
+    Returns:
+        (float): Количество строк в секунду
+    """
+    best = float('inf')
+    count = 0
+    for _ in range(repeat):
+        with open(file_name, encoding='utf-8-sig') as r_file:
+            file = csv.reader(r_file)
+            vacancy = next(file)
+            start = time.perf_counter()
+            count = sum(1 for _ in reader_to_rows(vacancy, file))
+            best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def benchmark_change_string(file_name: str):
+    """Сравнивает скорость очистки строк до и после разделения очистки по столбцам
+    Args:
+        file_name (str): Имя файла
+    """
+    before = rows_per_second(old_reader_to_rows, file_name)
+    after = rows_per_second(DataSet.reader_to_rows, file_name)
+    print(f"Очистка строк {file_name}: до {before:.0f} строк/с, после {after:.0f} строк/с, "
+          f"ускорение в {after / before:.2f} раза")
+
+
+def bytes_per_vacancy(build, rows: list):
+    """Замеряет через tracemalloc, сколько памяти занимает структура с вакансиями, собранная из готовых строк
+    Args:
+        build: Функция, собирающая структуру из списка словарей
+        rows (list): Список словарей со строками файла
+    Returns:
+        (float): Количество байт на одну вакансию
+    """
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    vacancies = build(rows)
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del vacancies
+    return size / len(rows)
+
+
+def benchmark_memory(file_name: str):
+    """Печатает, сколько байт занимает одна вакансия в виде объектов Vacancy и в колоночной таблице VacancyTable
+    Args:
+        file_name (str): Имя файла
+    """
+    rows = list(DataSet(file_name, use_cache=False).file_to_rows())
+    objects = bytes_per_vacancy(lambda x: [Vacancy(row) for row in x], rows)
+    table = bytes_per_vacancy(VacancyTable.from_rows, rows)
+    print(f"Память {file_name}: Vacancy {objects:.0f} байт на вакансию, VacancyTable {table:.0f} байт на вакансию")
+
+
+def best_time(function, repeat=3):
+    """Замеряет время работы функции, берётся лучший результат из нескольких запусков
+    Args:
+        function: Функция без аргументов
+        repeat (int): Количество запусков
+    Returns:
+        (float): Время в секундах
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark_name_matching(file_name: str, job_name="Программист", ratios=(1.0, 0.5, 0.1, 0.01, 0.001)):
+    """Сравнивает поиск профессии в названии каждой строки и в каждом различном названии с раскладкой по кодам.
+    Названия файла перемешиваются так, чтобы доля различных названий была равна заданной
+    Args:
+        file_name (str): Имя файла
+        job_name (str): Название профессии
+        ratios (tuple): Доли различных названий среди всех строк
+    """
+    table = DataSet(file_name).table
+    names = table.dictionaries["name"]
+    print(f"Поиск профессии {file_name}: в файле {len(names)} различных названий на {len(table)} строк")
+    random = np.random.default_rng(0)
+    for ratio in ratios:
+        distinct = max(1, int(len(table) * ratio))
+        pool = [names[i % len(names)] if i < len(names) else f"{names[i % len(names)]} {i}" for i in range(distinct)]
+        codes = random.integers(0, distinct, len(table))
+        rows = np.array(pool, object)[codes]
+        by_rows = best_time(lambda: np.flatnonzero(np.fromiter((x.find(job_name) >= 0 for x in rows), bool, len(rows))))
+        by_names = best_time(lambda: AnalyzeSet.match_jobs(pool, codes, [job_name]))
+        print(f"Доля различных названий {ratio:g}: по строкам {by_rows * 1000:.2f} мс, "
+              f"по названиям {by_names * 1000:.2f} мс, ускорение в {by_rows / by_names:.2f} раза")
+
+
+if __name__ == '__main__':
+    files = sys.argv[1:] or ["vacancies_medium.csv", "vacancies_big.csv"]
+    for file_name in files:
+        benchmark_change_string(file_name)
+        benchmark_memory(file_name)
+        benchmark_name_matching(file_name)
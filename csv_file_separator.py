@@ -1,33 +1,317 @@
-import pandas as pd
+import argparse
+import csv
+import multiprocessing
 import os
 import glob
+import hashlib
+import json
+import shutil
+import numpy as np
+
+from main import currency, currency_to_rub, split_file
 
 
 class Separator(object):
     """Класс для разделения файла на части
     """
+    buffer_size = 1 << 16
+
+    @staticmethod
+    def read_lines(file_name: str, start: int, end: int):
+        """Читает строки части файла по одной, не загружая часть в память целиком
+        Args:
+            file_name (str): Имя файла
+            start (int): Начало части в байтах
+            end (int): Конец части в байтах
+        Returns:
+            (generator): Генератор строк файла
+        """
+        with open(file_name, 'rb') as file:
+            file.seek(start)
+            while start < end:
+                line = file.readline()
+                if not line:
+                    break
+                start += len(line)
+                yield line.decode('utf-8')
+
+    @staticmethod
+    def separate_range(file_name: str, header: list, start: int, end: int, directory: str, suffix="",
+                       write_header=True):
+        """Разбирает часть файла за один проход и дописывает каждую строку в файл своего года, год - первые четыре
+        символа published_at. На каждый год открыт один буферизованный файл, поэтому память ограничена буферами,
+        а не размером файла. Строки, в которых меньше столбцов, чем в заголовке, или нет даты публикации,
+        отбрасываются
+        Args:
+            file_name (str): Имя файла
+            header (list): Названия столбцов таблицы
+            start (int): Начало части в байтах
+            end (int): Конец части в байтах
+            directory (str): Папка для файлов по годам
+            suffix (str): Окончание имён файлов по годам
+            write_header (bool): Писать ли заголовок таблицы, для частей файла он не пишется
+        Returns:
+            (list): Годы в порядке их первого появления в части
+        """
+        index = header.index('published_at')
+        files = {}
+        writers = {}
+        try:
+            for row in csv.reader(Separator.read_lines(file_name, start, end)):
+                if len(row) < len(header) or not row[index]:
+                    continue
+                year = row[index][:4]
+                if year not in writers:
+                    files[year] = open(os.path.join(directory, f"vacancies_by_{year}.csv{suffix}"), 'w',
+                                       encoding='utf-8', newline='', buffering=Separator.buffer_size)
+                    writers[year] = csv.writer(files[year], lineterminator='\n')
+                    if write_header:
+                        writers[year].writerow(header)
+                writers[year].writerow(row)
+        finally:
+            for file in files.values():
+                file.close()
+        return list(writers.keys())
+
+    @staticmethod
+    def write_columnar(csv_name: str):
+        """Переводит csv файл одного года в сжатый npz файл со столбцами, нужными для анализа: годом, средней
+        зарплатой в рублях и кодами названий и регионов. Строки с пустыми значениями отбрасываются, как при чтении
+        csv в DataSet.file_to_rows. Исходный csv файл удаляется
+        Args:
+            csv_name (str): Имя csv файла
+        Returns:
+            (str): Имя npz файла
+        """
+        with open(csv_name, encoding='utf-8-sig', newline='') as file:
+            reader = csv.reader(file)
+            header = next(reader)
+            index = {column: i for i, column in enumerate(header)}
+            years, salaries, name_codes, area_codes = [], [], [], []
+            names, areas = {}, {}
+            for row in reader:
+                if sum(1 for value in row if value) != len(header):
+                    continue
+                years.append(int(row[index['published_at']][:4]))
+                salaries.append((float(row[index['salary_from']]) + float(row[index['salary_to']])) / 2 *
+                                currency_to_rub[currency[row[index['salary_currency']]]])
+                name_codes.append(names.setdefault(row[index['name']], len(names)))
+                area_codes.append(areas.setdefault(row[index['area_name']], len(areas)))
+        npz_name = os.path.splitext(csv_name)[0] + '.npz'
+        np.savez_compressed(npz_name, year=np.array(years, dtype=np.int16),
+                            salary=np.array(salaries, dtype=np.float64),
+                            name=np.array(name_codes, dtype=np.int32), names=np.array(list(names), dtype=str),
+                            area=np.array(area_codes, dtype=np.int32), areas=np.array(list(areas), dtype=str))
+        os.remove(csv_name)
+        return npz_name
+
+    @staticmethod
+    def partition_stats(csv_name: str):
+        """Считает сводку по csv файлу одного года для манифеста: количество строк, первую и последнюю дату
+        публикации, различные регионы и суммы зарплат в рублях по годам, регионам и парам год-регион. Учитываются
+        только строки без пустых значений, как при анализе
+        Args:
+            csv_name (str): Имя csv файла
+        Returns:
+            (dict): Сводка по файлу, None, если в файле нет нужных для анализа столбцов
+        """
+        rows = 0
+        dates = []
+        years, areas, groups = {}, {}, {}
+        with open(csv_name, encoding='utf-8-sig', newline='') as file:
+            reader = csv.reader(file)
+            header = next(reader)
+            index = {column: i for i, column in enumerate(header)}
+            if not {'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at'} <= set(index):
+                return None
+            for row in reader:
+                if sum(1 for value in row if value) != len(header):
+                    continue
+                published_at = row[index['published_at']]
+                year, area = int(published_at[:4]), row[index['area_name']]
+                salary = (float(row[index['salary_from']]) + float(row[index['salary_to']])) / 2 * \
+                    currency_to_rub[currency[row[index['salary_currency']]]]
+                rows += 1
+                dates = [min(dates[0], published_at), max(dates[1], published_at)] if dates else [published_at] * 2
+                for key, stats in ((year, years), (area, areas), ((year, area), groups)):
+                    number, salary_sum = stats.get(key, (0, 0))
+                    stats[key] = (number + 1, salary_sum + salary)
+        return {"rows": rows,
+                "min_published_at": dates[0] if dates else None,
+                "max_published_at": dates[1] if dates else None,
+                "areas": sorted(areas),
+                "years": {str(year): list(stats) for year, stats in years.items()},
+                "by_area": {area: list(stats) for area, stats in areas.items()},
+                "groups": [[year, area, *stats] for (year, area), stats in groups.items()]}
+
+    @staticmethod
+    def file_hash(file_name: str):
+        """Считает sha256 содержимого файла, читая его блоками
+        Args:
+            file_name (str): Имя файла
+        Returns:
+            (str): Шестнадцатеричная запись хеша
+        """
+        digest = hashlib.sha256()
+        with open(file_name, 'rb') as file:
+            for block in iter(lambda: file.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def is_fresh(file_name: str, stats: dict):
+        """Проверяет, что файл не менялся после записи его сводки в манифест
+        Args:
+            file_name (str): Имя файла
+            stats (dict): Сводка по файлу из манифеста
+        Returns:
+            (bool): True, если размер и время изменения файла совпадают со сводкой
+        """
+        return os.path.exists(file_name) and \
+            (os.stat(file_name).st_size, os.stat(file_name).st_mtime_ns) == (stats["size"], stats["mtime_ns"])
+
+    @staticmethod
+    def finish_partition(csv_name: str, columnar: bool, staged_name=None, old_stats=None):
+        """Считает сводку по файлу года и, если нужно, переводит его в npz. При повторном разделении новый файл года
+        сначала пишется рядом со старым, и если хеш его содержимого совпадает с хешем из манифеста, а старый файл не
+        менялся, то новый файл удаляется, а старый остаётся нетронутым вместе со временем изменения
+        Args:
+            csv_name (str): Имя csv файла
+            columnar (bool): Переводить ли файл в npz
+            staged_name (str): Имя только что записанного файла года, который заменит старый, по умолчанию None
+            old_stats (dict): Сводка по старому файлу года из манифеста, по умолчанию None
+        Returns:
+            (tuple): Имя итогового файла и его сводка с размером и временем изменения файла или None
+        """
+        digest = Separator.file_hash(staged_name or csv_name)
+        file_name = os.path.splitext(csv_name)[0] + '.npz' if columnar else csv_name
+        if staged_name and old_stats and old_stats.get("sha256") == digest and Separator.is_fresh(file_name,
+                                                                                                   old_stats):
+            os.remove(staged_name)
+            return os.path.basename(file_name), old_stats
+        if staged_name:
+            os.replace(staged_name, csv_name)
+        stats = Separator.partition_stats(csv_name)
+        if columnar:
+            Separator.write_columnar(csv_name)
+        if stats is not None:
+            stat = os.stat(file_name)
+            stats["size"], stats["mtime_ns"], stats["sha256"] = stat.st_size, stat.st_mtime_ns, digest
+        return os.path.basename(file_name), stats
+
+    @staticmethod
+    def read_manifest(directory: str):
+        """Читает сводки файлов из манифеста папки
+        Args:
+            directory (str): Папка с файлами по годам
+        Returns:
+            (dict): Сводки по именам файлов, пустой словарь, если манифеста нет
+        """
+        manifest_name = os.path.join(directory, 'manifest.json')
+        if not os.path.exists(manifest_name):
+            return {}
+        with open(manifest_name, encoding='utf-8') as file:
+            manifest = json.load(file)
+        return manifest["partitions"] if manifest.get("version") == 1 else {}
+
+    @staticmethod
+    def write_manifest(directory: str, partitions: dict):
+        """Дописывает сводки файлов в манифест папки, убирая записи о файлах, которых больше нет. Манифест
+        записывается во временный файл и подменяет старый целиком
+        Args:
+            directory (str): Папка с файлами по годам
+            partitions (dict): Сводки по именам файлов, файлы со сводкой None в манифест не попадают
+        """
+        manifest_name = os.path.join(directory, 'manifest.json')
+        manifest = {"version": 1, "partitions": Separator.read_manifest(directory)}
+        manifest["partitions"].update({name: stats for name, stats in partitions.items() if stats is not None})
+        manifest["partitions"] = {name: stats for name, stats in sorted(manifest["partitions"].items())
+                                  if os.path.exists(os.path.join(directory, name))}
+        with open(manifest_name + '.tmp', 'w', encoding='utf-8') as file:
+            json.dump(manifest, file, ensure_ascii=False)
+        os.replace(manifest_name + '.tmp', manifest_name)
+
     @staticmethod
-    def separate_file_by_year_by_year(file_name: str):
-        """Метод для разделения фалы на части по годам
+    def separate_file_by_year_by_year(file_name: str, processes=1, directory='temp_csv', columnar=False,
+                                      incremental=False):
+        """Метод для разделения фалы на части по годам. Файл читается один раз, при нескольких процессах каждый
+        процесс разбирает свою часть файла, после чего части склеиваются по годам в порядке частей. Сводки по
+        файлам записываются в manifest.json той же папки
+        Args:
+            file_name (str): Имя файла
+            processes (int): Количество процессов, по умолчанию 1
+            directory (str): Папка для файлов по годам, создаётся, если её нет, по умолчанию temp_csv
+            columnar (bool): Сохранять годы в сжатые npz файлы по столбцам вместо csv, по умолчанию False
+            incremental (bool): Перезаписывать только годы, содержимое которых изменилось, и удалять файлы годов,
+                которых больше нет, по умолчанию False - старые файлы папки удаляются перед разделением
         """
-        file_name = file_name
-        file = pd.read_csv(file_name)
-        file['years'] = file['published_at'].apply(lambda x: x[:4])
-        years = file['years'].unique()
-        for year in years:
-            data = file[file['years'] == year]
-            data.loc[:, data.columns != 'years'].to_csv(f"temp_csv/vacancies_by_{year}.csv", index=False)
-        print("Files were separate by year: " + years)
+        with open(file_name, encoding='utf-8-sig', newline='') as file:
+            header = next(csv.reader(file))
+        os.makedirs(directory, exist_ok=True)
+        if not incremental:
+            Separator.delete_files(directory)
+        stage = '.new' if incremental else ''
+        ranges = split_file(file_name, processes)
+        if len(ranges) < 2:
+            years = Separator.separate_range(file_name, header, *(ranges or [(0, 0)])[0], directory, stage)
+        else:
+            tasks = [(file_name, header, start, end, directory, f".part{i}", False)
+                     for i, (start, end) in enumerate(ranges)]
+            with multiprocessing.Pool(len(tasks)) as pool:
+                parts = pool.starmap(Separator.separate_range, tasks)
+            years = list(dict.fromkeys(year for part in parts for year in part))
+            for year in years:
+                with open(os.path.join(directory, f"vacancies_by_{year}.csv{stage}"), 'w', encoding='utf-8',
+                          newline='') as file:
+                    csv.writer(file, lineterminator='\n').writerow(header)
+                    for i, part in enumerate(parts):
+                        if year in part:
+                            part_name = os.path.join(directory, f"vacancies_by_{year}.csv.part{i}")
+                            with open(part_name, encoding='utf-8', newline='') as part_file:
+                                shutil.copyfileobj(part_file, file)
+                            os.remove(part_name)
+        old = Separator.read_manifest(directory) if incremental else {}
+        tasks = [(os.path.join(directory, f"vacancies_by_{year}.csv"), columnar,
+                  os.path.join(directory, f"vacancies_by_{year}.csv{stage}") if incremental else None,
+                  old.get(f"vacancies_by_{year}.{'npz' if columnar else 'csv'}")) for year in years]
+        if len(ranges) < 2:
+            partitions = [Separator.finish_partition(*task) for task in tasks]
+        else:
+            with multiprocessing.Pool(len(ranges)) as pool:
+                partitions = pool.starmap(Separator.finish_partition, tasks)
+        if incremental:
+            names = {name for name, stats in partitions}
+            for path in glob.glob(os.path.join(directory, 'vacancies_by_*.csv')) + \
+                    glob.glob(os.path.join(directory, 'vacancies_by_*.npz')):
+                if os.path.basename(path) not in names:
+                    os.remove(path)
+        Separator.write_manifest(directory, dict(partitions))
+        print("Files were separate by year: " + " ".join(years))
+        if incremental:
+            print("Unchanged years: " + " ".join(year for year, (name, stats) in zip(years, partitions)
+                                                 if stats is not None and stats == old.get(name)))
 
     @staticmethod
-    def delete_files():
+    def delete_files(directory='temp_csv'):
         """Метод для удаления старых версий разделения файлов из папки temp_csv
+        Args:
+            directory (str): Папка для файлов по годам, по умолчанию temp_csv
         """
-        files = glob.glob('temp_csv/*')
+        files = glob.glob(os.path.join(directory, '*'))
         for f in files:
             os.remove(f)
         print("Files were delete")
 
 
-Separator().delete_files()
-Separator().separate_file_by_year_by_year('vacancies_by_year.csv')
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Разделение файла с вакансиями на файлы по годам")
+    parser.add_argument("file_name", nargs='?', default='vacancies_by_year.csv', help="Файл с вакансиями (.csv)")
+    parser.add_argument("--processes", type=int, default=multiprocessing.cpu_count(),
+                        help="Количество процессов для разделения файла")
+    parser.add_argument("--directory", default='temp_csv', help="Папка для файлов по годам")
+    parser.add_argument("--columnar", action="store_true", help="Сохранять годы в npz файлы по столбцам")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Не удалять старые файлы, а перезаписывать только изменившиеся годы")
+    args = parser.parse_args()
+    Separator().separate_file_by_year_by_year(args.file_name, args.processes, args.directory, args.columnar,
+                                              args.incremental)
@@ -1,13 +1,23 @@
 import csv
+import functools
+import hashlib
+import heapq
+import io
+import json
+import multiprocessing
+import os
 import re
+import sys
+import textwrap
+from array import array
+from collections import deque
+from itertools import chain, islice
 import matplotlib.pyplot as plt
 import numpy as np
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from openpyxl import Workbook
 from openpyxl.styles import Font, Border, Side
 from jinja2 import Environment, FileSystemLoader
-import prettytable
-from prettytable import PrettyTable
 import pdfkit
 
 
@@ -22,6 +32,37 @@ def exp_for_num(s: str):
     return 0 if len(s) == 0 else int(s[0])
 
 
+@functools.lru_cache(maxsize=1 << 16)
+def parse_published_at(s: str):
+    """Быстро преобразует дату публикации формата 2022-07-05T18:19:30+0300 в datetime срезами строки, результат
+    запоминается, так как у многих вакансий дата совпадает. Строки другого формата разбираются через strptime
+    Args:
+        s (str): Дата публикации вакансии
+    Returns:
+        datetime: Дата с часовым поясом, такая же, как у datetime.strptime(s, '%Y-%m-%dT%H:%M:%S%z')
+    """
+    if len(s) != 24 or s[4] != '-' or s[7] != '-' or s[10] != 'T' or s[13] != ':' or s[16] != ':' or \
+            s[19] not in '+-':
+        return datetime.strptime(s, '%Y-%m-%dT%H:%M:%S%z')
+    digits = s[:4] + s[5:7] + s[8:10] + s[11:13] + s[14:16] + s[17:19] + s[20:]
+    if not (digits.isascii() and digits.isdigit()):
+        return datetime.strptime(s, '%Y-%m-%dT%H:%M:%S%z')
+    return datetime(int(s[:4]), int(s[5:7]), int(s[8:10]), int(s[11:13]), int(s[14:16]), int(s[17:19]),
+                    tzinfo=time_zone(s[19:]))
+
+
+@functools.lru_cache(maxsize=None)
+def time_zone(s: str):
+    """Возвращает часовой пояс по смещению формата +0300, один объект на каждое смещение
+    Args:
+        s (str): Смещение относительно UTC
+    Returns:
+        timezone: Часовой пояс
+    """
+    offset = timedelta(hours=int(s[1:3]), minutes=int(s[3:5]))
+    return timezone(-offset if s[0] == '-' else offset)
+
+
 headings = ['№', 'Название', 'Описание', 'Навыки', 'Опыт работы', 'Премиум-вакансия', 'Компания',
             'Оклад', 'Название региона', 'Дата публикации вакансии']
 currency = {"AZN": "Манаты",
@@ -52,32 +93,188 @@ currency_to_rub = {
     "Доллары": 60.66,
     "Узбекский сум": 0.0055,
 }
+html_tags = re.compile("<[^>]*>")
+filter_separators = re.compile(r"\s+(&&|\|\|)\s+(?=[^:&|]+:)")
+text_columns = {"name", "description", "key_skills", "employer_name", "area_name"}
 functions_for_filter = {
-    "Название": lambda vacancy, value: vacancy.name == value,
-    "Описание": lambda vacancy, value: vacancy.description == value,
-    "Компания": lambda vacancy, value: vacancy.employer_name == value,
-    "Навыки": lambda vacancy, values: all(x in vacancy.key_skills for x in values.split(', ')),
-    "Опыт работы": lambda vacancy, value: vacancy.experience_id == value,
-    "Премиум-вакансия": lambda vacancy, value: vacancy.premium == value,
-    "Название региона": lambda vacancy, value: vacancy.area_name == value,
-    "Идентификатор валюты оклада": lambda vacancy, value: vacancy.salary.salary_currency == value,
-    "Дата публикации вакансии": lambda vacancy, value: vacancy.published_at.strftime("%d.%m.%Y") == value,
-    "Оклад": lambda vacancy, value: vacancy.salary.salary_from <= float(value) <= vacancy.salary.salary_to,
+    "Название": lambda index, value: index.lookup("name", value),
+    "Описание": lambda index, value: np.flatnonzero(index.table.description == value),
+    "Компания": lambda index, value: index.lookup("employer_name", value),
+    "Навыки": lambda index, values: index.lookup_all("key_skills", values.split(', ')),
+    "Опыт работы": lambda index, value: index.lookup("experience_id", value),
+    "Премиум-вакансия": lambda index, value: index.lookup("premium", value),
+    "Название региона": lambda index, value: index.lookup("area_name", value),
+    "Идентификатор валюты оклада": lambda index, value: index.lookup("salary_currency", value),
+    "Дата публикации вакансии": lambda index, value: index.lookup_dates(*value.split(' - ')) if ' - ' in value else
+    index.lookup("published_at", value),
+    "Оклад": lambda index, value: index.lookup_salaries(*map(float, value.split(' - '))) if ' - ' in value else
+    index.salaries.stab(float(value)),
 }
 functions_for_sort = {
-    "Название": lambda vacancy: vacancy.name,
-    "Описание": lambda vacancy: vacancy.description,
-    "Компания": lambda vacancy: vacancy.employer_name,
-    "Навыки": lambda vacancy: len(vacancy.key_skills),
-    "Опыт работы": lambda vacancy: exp_for_num(vacancy.experience_id),
-    "Премиум-вакансия": lambda vacancy: vacancy.premium,
-    "Название региона": lambda vacancy: vacancy.area_name,
-    "Идентификатор валюты оклада": lambda vacancy: vacancy.salary.salary_currency,
-    "Дата публикации вакансии": lambda vacancy: vacancy.published_at,
-    "Оклад": lambda vacancy: vacancy.salary.mid_salary_in_rubles
+    "Название": lambda table: table.rank("name"),
+    "Описание": lambda table: table.description,
+    "Компания": lambda table: table.rank("employer_name"),
+    "Навыки": lambda table: np.fromiter((x.count(';;') + 1 for x in table.key_skills), np.int32, len(table)),
+    "Опыт работы": lambda table: np.array([exp_for_num(x) for x in table.display_values("experience_id")],
+                                          np.int32)[table.experience_id],
+    "Премиум-вакансия": lambda table: np.array([bools["False"], bools["True"]], object)[table.premium.astype(int)],
+    "Название региона": lambda table: table.rank("area_name"),
+    "Идентификатор валюты оклада": lambda table: table.rank("salary_currency"),
+    "Дата публикации вакансии": lambda table: np.array(
+        [parse_published_at(x) for x in table.published_at], object),
+    "Оклад": lambda table: table.mid_salary_in_rubles
 }
 
 
+def parse_filter(expression: str):
+    """Разбирает выражение фильтрации вида "Параметр: значение && Параметр: значение || Параметр: значение",
+    && связывает сильнее, чем ||. Для даты публикации и оклада значение может быть диапазоном "от - до".
+    && и || считаются разделителями, только если они окружены пробелами и за ними идёт следующий "Параметр:",
+    поэтому значения вроде "A&&B" или "Johnson && Johnson" остаются целыми
+    Args:
+        expression (str): Выражение фильтрации
+    Returns:
+        (list): Список вариантов, каждый вариант - список условий [параметр, значение], которые должны
+            выполняться одновременно
+    """
+    plan = [[]]
+    for i, token in enumerate(filter_separators.split(expression.lstrip())):
+        if i % 2 == 0:
+            plan[-1].append(token.split(': ', 1))
+        elif token == '||':
+            plan.append([])
+    return plan
+
+
+def parse_sort(sort_params: str, is_sort_reverse=False):
+    """Разбирает параметры сортировки вида "Параметр, -Параметр": сортировка идёт по первому параметру, при равенстве
+    по второму и так далее, минус меняет направление сортировки параметра на противоположное
+    Args:
+        sort_params (str): Параметры сортировки через запятую
+        is_sort_reverse (bool): Атрибут, который указывает на необходимость обратной сортировки
+    Returns:
+        (tuple): Кортеж пар (параметр, сортировать ли по убыванию)
+    """
+    return tuple((param.strip().lstrip('-'), is_sort_reverse != param.strip().startswith('-'))
+                 for param in sort_params.split(','))
+
+
+def stable_argsort(keys: np.ndarray, is_sort_reverse=False):
+    """Устойчиво сортирует индексы массива ключей, в том числе в обратном порядке, как это делает sorted(reverse=True)
+    Args:
+        keys (np.ndarray): Массив ключей сортировки
+        is_sort_reverse (bool): Атрибут, который указывает на необходимость обратной сортировки
+    Returns:
+        (np.ndarray): Перестановка индексов
+    """
+    if not is_sort_reverse:
+        return np.argsort(keys, kind='stable')
+    return (len(keys) - 1 - np.argsort(keys[::-1], kind='stable'))[::-1]
+
+
+def top_k_argsort(keys: np.ndarray, k: int, is_sort_reverse=False):
+    """Возвращает первые k индексов устойчивой сортировки без сортировки всего массива. Для числовых ключей
+    находится k-й по порядку ключ через np.partition и сортируются только ключи не хуже него, для остальных
+    ключей k лучших выбираются кучей
+    Args:
+        keys (np.ndarray): Массив ключей сортировки
+        k (int): Количество нужных индексов
+        is_sort_reverse (bool): Атрибут, который указывает на необходимость обратной сортировки
+    Returns:
+        (np.ndarray): Первые k индексов перестановки stable_argsort(keys, is_sort_reverse)
+    """
+    n = len(keys)
+    if k >= n:
+        return stable_argsort(keys, is_sort_reverse)
+    if k <= 0:
+        return np.zeros(0, np.int64)
+    if keys.dtype == object:
+        if is_sort_reverse:
+            return np.array(heapq.nlargest(k, range(n), key=lambda i: (keys[i], -i)), np.int64)
+        return np.array(heapq.nsmallest(k, range(n), key=lambda i: (keys[i], i)), np.int64)
+    if is_sort_reverse:
+        candidates = np.flatnonzero(keys >= np.partition(keys, n - k)[n - k])
+    else:
+        candidates = np.flatnonzero(keys <= np.partition(keys, k - 1)[k - 1])
+    return candidates[stable_argsort(keys[candidates], is_sort_reverse)[:k]]
+
+
+def split_file(file_name: str, parts: int):
+    """Делит csv файл на части по байтам так, чтобы каждая часть начиналась с новой строки таблицы. Перенос строки
+    внутри кавычек (многострочное описание вакансии) границей не считается
+    Args:
+        file_name (str): Имя файла
+        parts (int): Желаемое количество частей
+    Returns:
+        (list): Список пар (начало, конец) в байтах, заголовок таблицы в части не входит
+    """
+    size = os.path.getsize(file_name)
+    with open(file_name, 'rb') as file:
+        file.readline()
+        bounds = [file.tell()]
+        targets = [bounds[0] + (size - bounds[0]) * i // parts for i in range(1, parts)]
+        position = bounds[0]
+        in_quotes = False
+        while targets:
+            block = file.read(1 << 20)
+            if not block:
+                break
+            counted = 0
+            index = max(targets[0] - position, 0)
+            while targets and index < len(block):
+                index = block.find(b'\n', index)
+                if index < 0:
+                    break
+                in_quotes ^= block.count(b'"', counted, index) % 2 == 1
+                counted = index
+                index += 1
+                if not in_quotes:
+                    if position + index > bounds[-1]:
+                        bounds.append(position + index)
+                    while targets and targets[0] <= position + index:
+                        targets.pop(0)
+                    index = max(targets[0] - position, index) if targets else index
+            in_quotes ^= block.count(b'"', counted) % 2 == 1
+            position += len(block)
+    if bounds[-1] < size:
+        bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def analyze_file_range(file_name: str, header: list, start: int, end: int, job_name, keep_table=False):
+    """Разбирает часть csv файла и считает по ней групповые суммы, функция выполняется в отдельном процессе
+    Args:
+        file_name (str): Имя файла
+        header (list): Названия столбцов таблицы
+        start (int): Начало части в байтах
+        end (int): Конец части в байтах
+        job_name (str или list): Название профессии или список названий профессий
+        keep_table (bool): Атрибут, указывающий на необходимость вернуть вместе с суммами и саму таблицу части
+    Returns:
+        (AnalyzeSet или tuple): Групповые суммы по части файла, или суммы и таблица части
+    """
+    with open(file_name, 'rb') as file:
+        file.seek(start)
+        text = file.read(end - start).decode('utf-8')
+    rows = DataSet.reader_to_rows(header, csv.reader(io.StringIO(text, newline='')))
+    table = VacancyTable.from_rows(rows)
+    return (AnalyzeSet.from_table(table, job_name), table) if keep_table else AnalyzeSet.from_table(table, job_name)
+
+
+def file_fingerprint(file_name: str):
+    """Снимает отпечаток файла, по которому проверяется, что кэш построен именно по этой версии файла
+    Args:
+        file_name (str): Имя файла
+    Returns:
+        (dict): Путь, размер, время изменения файла и хэш строки заголовка
+    """
+    stat = os.stat(file_name)
+    with open(file_name, 'rb') as file:
+        header = file.readline()
+    return {"path": os.path.abspath(file_name), "size": stat.st_size, "mtime": stat.st_mtime_ns,
+            "header": hashlib.sha1(header).hexdigest()}
+
+
 class Salary:
     """Класс для представления зарплаты
     Attributes:
@@ -87,6 +284,7 @@ class Salary:
         salary_gross (bool): Атрибут показывает есть ли налоговый вычет у зарплаты, по умолчанию значение False
         mid_salary_in_rubles (float): Среднее значение зарплаты в рублях
     """
+    __slots__ = ("salary_from", "salary_to", "salary_currency", "salary_gross", "mid_salary_in_rubles")
 
     def __init__(self, salary: list):
         """Иницилизирует объект Salary, распаковывая все данные о зарплате, кроме налогового вычета
@@ -126,27 +324,56 @@ class Vacancy(object):
         experience_id (str): Опыт работы требуемый для вакансии
         premium (bool): Примиальность вакансии
         employer_name (str): Название компании вакансии
+    Поля published_at и key_skills хранятся строками из файла и преобразуются только при первом обращении к ним,
+    после чего результат запоминается. Повторяющиеся строки (название, регион, компания) интернируются
     """
+    __slots__ = ("name", "salary", "area_name", "year", "description", "employer_name", "_published_at",
+                 "_key_skills", "_experience_id", "_premium")
 
     def __init__(self, vacancy: dict):
-        """Иницилизирует объект вакансии, распаковывает все данные и выполняет их конвертацию
+        """Иницилизирует объект вакансии, распаковывает данные, нужные для статистики, тяжёлые поля остаются строками
         Args:
             vacancy (dict): Словарь с данными о вакансии
         """
-        self.name = vacancy['name']
+        self.name = sys.intern(vacancy['name'])
         self.salary = Salary(
             [vacancy['salary_from'], vacancy['salary_to'], vacancy['salary_currency']])
-        self.area_name = vacancy['area_name']
+        self.area_name = sys.intern(vacancy['area_name'])
         self.year = self.make_date_from_str(vacancy['published_at'])
+        self._published_at = vacancy['published_at']
+        self.description = self.employer_name = self._key_skills = self._experience_id = self._premium = None
         if len(vacancy) > 6:
-            self.published_at = datetime.strptime(vacancy['published_at'], '%Y-%m-%dT%H:%M:%S%z')
             self.description = vacancy['description']
-            self.key_skills = vacancy['key_skills'].split(';;')
-            self.experience_id = experience[vacancy['experience_id']]
-            self.premium = bools[vacancy['premium']]
-            self.employer_name = vacancy['employer_name']
+            self.employer_name = sys.intern(vacancy['employer_name'])
+            self._key_skills = vacancy['key_skills']
+            self._experience_id = vacancy['experience_id']
+            self._premium = vacancy['premium']
             self.salary.add_gross(vacancy['salary_gross'])
 
+    @property
+    def published_at(self):
+        """Дата публикации вакансии (datetime), строка разбирается при первом обращении"""
+        if isinstance(self._published_at, str):
+            self._published_at = parse_published_at(self._published_at)
+        return self._published_at
+
+    @property
+    def key_skills(self):
+        """Список навыков, строка делится на навыки при первом обращении"""
+        if isinstance(self._key_skills, str):
+            self._key_skills = self._key_skills.split(';;')
+        return self._key_skills
+
+    @property
+    def experience_id(self):
+        """Опыт работы требуемый для вакансии в том виде, в котором он выводится пользователю"""
+        return experience[self._experience_id]
+
+    @property
+    def premium(self):
+        """Примиальность вакансии в виде строки из словаря bools"""
+        return bools[self._premium]
+
     @staticmethod
     def make_date_from_str(s: str):
         return int(s[:4])
@@ -191,48 +418,934 @@ class Vacancy(object):
                 self.published_at.strftime("%d.%m.%Y")]
 
 
+class VacancyTable(object):
+    """Колоночное хранилище вакансий: каждое поле хранится отдельным массивом numpy, а повторяющиеся строки
+    кодируются номерами в словаре значений
+    Attributes:
+        salary_from (np.ndarray): Нижние границы вилки оклада (float64)
+        salary_to (np.ndarray): Верхние границы вилки оклада (float64)
+        mid_salary_in_rubles (np.ndarray): Средние значения зарплат в рублях (float64)
+        year (np.ndarray): Годы публикации вакансий (int16)
+        area_name (np.ndarray): Коды названий регионов (int32)
+        salary_currency (np.ndarray): Коды валют оклада (int32)
+        experience_id (np.ndarray): Коды опыта работы (int32)
+        employer_name (np.ndarray): Коды названий компаний (int32)
+        premium (np.ndarray): Премиальность вакансий (bool)
+        salary_gross (np.ndarray): Наличие налогового вычета (bool)
+        name (np.ndarray): Коды названий вакансий (int32)
+        description (np.ndarray): Описания вакансий
+        key_skills (np.ndarray): Навыки в виде строк, разделённых ';;'
+        published_at (np.ndarray): Даты публикации вакансий в исходном виде
+        dictionaries (dict): Списки значений закодированных столбцов, номер значения в списке равен его коду
+        is_full (bool): Атрибут, указывающий, что в файле есть полная информация о вакансиях
+        strings (dict): Строковые столбцы, ещё не прочитанные из кэша столбцы хранятся как путь к файлу
+    """
+    encoded_columns = ["name", "area_name", "salary_currency", "experience_id", "employer_name"]
+    array_columns = ["salary_from", "salary_to", "mid_salary_in_rubles", "year", "name", "area_name",
+                     "salary_currency", "experience_id", "employer_name", "premium", "salary_gross"]
+    string_columns = ["description", "key_skills", "published_at"]
+    display = {"salary_currency": currency, "experience_id": experience}
+    cache_version = 3
+
+    def __init__(self, columns: dict, dictionaries: dict, is_full: bool):
+        """Инициализирует объект VacancyTable из уже готовых столбцов
+        Args:
+            columns (dict): Словарь с массивами столбцов, строковые столбцы могут быть заданы путём к файлу кэша
+            dictionaries (dict): Словарь со списками значений закодированных столбцов
+            is_full (bool): Атрибут, указывающий, что в файле есть полная информация о вакансиях
+        """
+        self.salary_from = columns["salary_from"]
+        self.salary_to = columns["salary_to"]
+        self.year = columns["year"]
+        self.name = columns["name"]
+        self.area_name = columns["area_name"]
+        self.salary_currency = columns["salary_currency"]
+        self.experience_id = columns.get("experience_id")
+        self.employer_name = columns.get("employer_name")
+        self.premium = columns.get("premium")
+        self.salary_gross = columns.get("salary_gross")
+        self.strings = {column: columns.get(column) for column in self.string_columns}
+        self.dictionaries = dictionaries
+        self.is_full = is_full
+        self.mid_salary_in_rubles = columns.get("mid_salary_in_rubles")
+        if self.mid_salary_in_rubles is None:
+            rates = np.array([currency_to_rub[currency[x]] for x in dictionaries["salary_currency"]], np.float64)
+            self.mid_salary_in_rubles = (self.salary_from + self.salary_to) / 2 * rates[self.salary_currency]
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Собирает таблицу из словарей со строками файла, не создавая промежуточных объектов Vacancy
+        Args:
+            rows: Итерируемый объект словарей, например генератор DataSet.file_to_rows
+        Returns:
+            (VacancyTable): Таблица вакансий
+        """
+        numbers = {"salary_from": array('d'), "salary_to": array('d'), "year": array('h')}
+        codes = {column: array('i') for column in cls.encoded_columns}
+        values = {column: dict() for column in cls.encoded_columns}
+        flags = {"premium": array('b'), "salary_gross": array('b')}
+        strings = {"description": [], "key_skills": [], "published_at": []}
+        is_full = False
+        for row in rows:
+            is_full = len(row) > 6
+            numbers["salary_from"].append(float(row['salary_from']))
+            numbers["salary_to"].append(float(row['salary_to']))
+            numbers["year"].append(Vacancy.make_date_from_str(row['published_at']))
+            strings["published_at"].append(row['published_at'])
+            if is_full:
+                flags["premium"].append(bools[row['premium']] == bools["True"])
+                flags["salary_gross"].append(row['salary_gross'] == "True" or row['salary_gross'] == "Да")
+                strings["description"].append(row['description'])
+                strings["key_skills"].append(row['key_skills'])
+            for column in cls.encoded_columns if is_full else ["name", "area_name", "salary_currency"]:
+                codes[column].append(values[column].setdefault(row[column], len(values[column])))
+        columns = {column: np.frombuffer(x, np.float64 if x.typecode == 'd' else np.int16).copy()
+                   for column, x in numbers.items()}
+        columns.update({column: np.frombuffer(x, np.int32).copy() for column, x in codes.items()})
+        columns.update({column: np.frombuffer(x, np.int8).astype(bool) for column, x in flags.items()})
+        columns.update({column: np.array(x, object) for column, x in strings.items()})
+        if not is_full:
+            for column in ["experience_id", "employer_name", "premium", "salary_gross", "description", "key_skills"]:
+                del columns[column]
+        return cls(columns, {column: list(x) for column, x in values.items()}, is_full)
+
+    @classmethod
+    def concat(cls, tables: list):
+        """Склеивает таблицы, собранные по частям файла, перекодируя закодированные столбцы в общий словарь
+        Args:
+            tables (list): Список таблиц в порядке частей файла
+        Returns:
+            (VacancyTable): Общая таблица вакансий
+        """
+        tables = [table for table in tables if len(table)] or tables[:1]
+        if len(tables) == 1:
+            return tables[0]
+        columns = {}
+        dictionaries = {column: dict() for column in cls.encoded_columns}
+        for column in cls.array_columns + cls.string_columns:
+            parts = [table.column(column) for table in tables]
+            if parts[0] is None:
+                continue
+            if column in dictionaries:
+                parts = [np.array([dictionaries[column].setdefault(x, len(dictionaries[column]))
+                                   for x in table.dictionaries[column]], np.int32)[part]
+                         for table, part in zip(tables, parts)]
+            columns[column] = np.concatenate(parts)
+        return cls(columns, {column: list(x) for column, x in dictionaries.items()}, tables[0].is_full)
+
+    def save(self, cache_name: str, fingerprint: dict):
+        """Сохраняет таблицу в папку кэша: числовые столбцы в формате .npy, строковые одним файлом на столбец
+        Args:
+            cache_name (str): Путь к папке кэша
+            fingerprint (dict): Отпечаток исходного файла, по которому кэш проверяется при чтении
+        """
+        os.makedirs(cache_name, exist_ok=True)
+        meta_name = os.path.join(cache_name, "meta.json")
+        if os.path.exists(meta_name):
+            os.remove(meta_name)
+        for column in self.array_columns:
+            if self.column(column) is not None:
+                np.save(os.path.join(cache_name, f"{column}.npy"), self.column(column))
+        for column in self.string_columns:
+            if self.column(column) is not None:
+                with open(os.path.join(cache_name, f"{column}.txt"), 'w', encoding='utf-8', newline='') as file:
+                    file.write('\0'.join(self.column(column)))
+        with open(meta_name, 'w', encoding='utf-8') as file:
+            json.dump({"version": self.cache_version, "fingerprint": fingerprint, "is_full": self.is_full,
+                       "length": len(self), "dictionaries": self.dictionaries}, file, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, cache_name: str, fingerprint: dict):
+        """Открывает таблицу из папки кэша без разбора csv: числовые столбцы отображаются в память,
+        строковые читаются только при первом обращении к ним
+        Args:
+            cache_name (str): Путь к папке кэша
+            fingerprint (dict): Отпечаток исходного файла
+        Returns:
+            (VacancyTable): Таблица вакансий или None, если кэша нет или он устарел
+        """
+        try:
+            with open(os.path.join(cache_name, "meta.json"), encoding='utf-8') as file:
+                meta = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if meta.get("version") != cls.cache_version or meta.get("fingerprint") != fingerprint:
+            return None
+        columns = {}
+        for column in cls.array_columns:
+            if os.path.exists(os.path.join(cache_name, f"{column}.npy")):
+                columns[column] = np.load(os.path.join(cache_name, f"{column}.npy"), mmap_mode='r')
+        for column in cls.string_columns:
+            if os.path.exists(os.path.join(cache_name, f"{column}.txt")):
+                columns[column] = os.path.join(cache_name, f"{column}.txt") if meta["length"] else np.array([], object)
+        return cls(columns, meta["dictionaries"], meta["is_full"])
+
+    def column(self, column: str):
+        """Возвращает столбец таблицы по названию
+        Args:
+            column (str): Название столбца
+        Returns:
+            (np.ndarray): Столбец или None, если такого столбца в файле нет
+        """
+        return self.string(column) if column in self.strings else getattr(self, column)
+
+    def string(self, column: str):
+        """Возвращает строковый столбец, при первом обращении читая его из файла кэша
+        Args:
+            column (str): Название строкового столбца
+        Returns:
+            (np.ndarray): Столбец строк или None, если такого столбца в файле нет
+        """
+        if isinstance(self.strings[column], str):
+            with open(self.strings[column], encoding='utf-8', newline='') as file:
+                self.strings[column] = np.array(file.read().split('\0'), object)
+        return self.strings[column]
+
+    @property
+    def description(self):
+        return self.string("description")
+
+    @property
+    def key_skills(self):
+        return self.string("key_skills")
+
+    @property
+    def published_at(self):
+        return self.string("published_at")
+
+    def __len__(self):
+        return len(self.year)
+
+    def display_values(self, column: str):
+        """Возвращает значения закодированного столбца в том виде, в котором они выводятся пользователю
+        Args:
+            column (str): Название закодированного столбца
+        Returns:
+            (list): Список значений, номер значения равен его коду
+        """
+        display = self.display.get(column, {})
+        return [display.get(x, x) for x in self.dictionaries[column]]
+
+    def rank(self, column: str):
+        """Заменяет коды закодированного столбца на их порядковые номера среди отсортированных значений
+        Args:
+            column (str): Название закодированного столбца
+        Returns:
+            (np.ndarray): Массив ключей, сравнимых так же, как и сами строки
+        """
+        values = self.display_values(column)
+        ranks = np.empty(len(values), np.int32)
+        ranks[sorted(range(len(values)), key=values.__getitem__)] = np.arange(len(values), dtype=np.int32)
+        return ranks[getattr(self, column)]
+
+    def row_dict(self, index: int):
+        """Собирает словарь одной строки файла, подходящий для преобразования в объект Vacancy
+        Args:
+            index (int): Номер строки в таблице
+        Returns:
+            (dict): Словарь с данными о вакансии
+        """
+        row = {'name': self.dictionaries["name"][self.name[index]],
+               'salary_from': self.salary_from[index],
+               'salary_to': self.salary_to[index],
+               'salary_currency': self.dictionaries["salary_currency"][self.salary_currency[index]],
+               'area_name': self.dictionaries["area_name"][self.area_name[index]],
+               'published_at': self.published_at[index]}
+        if self.is_full:
+            row.update({'description': self.description[index],
+                        'key_skills': self.key_skills[index],
+                        'experience_id': self.dictionaries["experience_id"][self.experience_id[index]],
+                        'premium': str(bool(self.premium[index])),
+                        'employer_name': self.dictionaries["employer_name"][self.employer_name[index]],
+                        'salary_gross': str(bool(self.salary_gross[index]))})
+        return row
+
+
+class VacancyView(object):
+    """Ленивое представление строк VacancyTable в виде объектов Vacancy, которые создаются только при обращении
+    Attributes:
+        table (VacancyTable): Таблица вакансий
+        indices (np.ndarray): Номера строк таблицы в порядке вывода
+    """
+
+    def __init__(self, table: VacancyTable, indices=None):
+        """Инициализирует объект VacancyView
+        Args:
+            table (VacancyTable): Таблица вакансий
+            indices (np.ndarray): Номера строк таблицы в порядке вывода, по умолчанию порядок как в файле
+        """
+        self.table = table
+        self.indices = np.arange(len(table)) if indices is None else indices
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return VacancyView(self.table, self.indices[item])
+        return Vacancy(self.table.row_dict(self.indices[item]))
+
+    def __iter__(self):
+        return (Vacancy(self.table.row_dict(i)) for i in self.indices)
+
+
+class IntervalTree(object):
+    """Центрированное дерево отрезков для поиска всех отрезков, содержащих точку, за O(log n + k).
+    В каждом узле хранятся отрезки, содержащие центр узла, отсортированные по левой и по правой границе,
+    отрезки левее центра уходят в левое поддерево, правее - в правое
+    Attributes:
+        center (float): Центр узла, медиана границ отрезков узла
+        starts (np.ndarray): Левые границы отрезков, содержащих центр, по возрастанию
+        start_ids (np.ndarray): Номера отрезков в порядке starts
+        ends (np.ndarray): Правые границы отрезков, содержащих центр, по возрастанию
+        end_ids (np.ndarray): Номера отрезков в порядке ends
+        left (IntervalTree): Поддерево отрезков левее центра, None если их нет
+        right (IntervalTree): Поддерево отрезков правее центра, None если их нет
+    """
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray, ids: np.ndarray = None):
+        """Инициализирует объект IntervalTree, отрезки с левой границей больше правой не попадают в дерево
+        Args:
+            starts (np.ndarray): Левые границы отрезков
+            ends (np.ndarray): Правые границы отрезков
+            ids (np.ndarray): Номера отрезков, по умолчанию номера по порядку
+        """
+        if ids is None:
+            ids = np.flatnonzero(starts <= ends)
+            starts, ends = starts[ids], ends[ids]
+        self.center = float(np.median(np.concatenate([starts, ends]))) if len(ids) else 0.0
+        left, right = ends < self.center, starts > self.center
+        middle = ~(left | right)
+        order = np.argsort(starts[middle], kind='stable')
+        self.starts, self.start_ids = starts[middle][order], ids[middle][order]
+        order = np.argsort(ends[middle], kind='stable')
+        self.ends, self.end_ids = ends[middle][order], ids[middle][order]
+        self.left = IntervalTree(starts[left], ends[left], ids[left]) if left.any() else None
+        self.right = IntervalTree(starts[right], ends[right], ids[right]) if right.any() else None
+
+    def stab(self, value: float):
+        """Находит отрезки, содержащие точку
+        Args:
+            value (float): Точка
+        Returns:
+            (np.ndarray): Отсортированный массив номеров отрезков
+        """
+        parts = [np.zeros(0, np.int64)]
+        node = self
+        while node is not None:
+            if value < node.center:
+                parts.append(node.start_ids[:np.searchsorted(node.starts, value, 'right')])
+                node = node.left
+            elif value > node.center:
+                parts.append(node.end_ids[np.searchsorted(node.ends, value, 'left'):])
+                node = node.right
+            else:
+                parts.append(node.start_ids)
+                node = None
+        return np.sort(np.concatenate(parts))
+
+
+class VacancyIndex(object):
+    """Индексы по таблице вакансий для фильтрации без полного перебора: для каждого значения поля хранится
+    отсортированный массив номеров строк, в которых оно встречается. Индекс по полю строится один раз,
+    при первом запросе к этому полю
+    Attributes:
+        table (VacancyTable): Таблица вакансий
+        postings (dict): Индексы по полям, каждый индекс - словарь со значениями поля и номерами строк
+        _salaries (IntervalTree): Дерево вилок окладов, None пока не построено
+        _salary_bounds (tuple): Номера строк по возрастанию левой границы вилки, отсортированные левые и правые
+            границы вилок окладов, None пока не посчитаны
+    """
+
+    def __init__(self, table: VacancyTable):
+        """Инициализирует объект VacancyIndex
+        Args:
+            table (VacancyTable): Таблица вакансий
+        """
+        self.table = table
+        self.postings = dict()
+        self._salaries = None
+        self._salary_bounds = None
+
+    @property
+    def salaries(self):
+        """Дерево вилок окладов, которое строится при первом запросе
+        Returns:
+            (IntervalTree): Дерево отрезков (salary_from, salary_to), номер отрезка равен номеру строки
+        """
+        if self._salaries is None:
+            self._salaries = IntervalTree(self.table.salary_from, self.table.salary_to)
+        return self._salaries
+
+    @property
+    def salary_bounds(self):
+        """Отсортированные границы вилок окладов, вилки с левой границей больше правой не учитываются
+        Returns:
+            (tuple): Номера строк по возрастанию левой границы, левые границы и правые границы по возрастанию
+        """
+        if self._salary_bounds is None:
+            rows = np.flatnonzero(self.table.salary_from <= self.table.salary_to)
+            rows = rows[np.argsort(self.table.salary_from[rows], kind='stable')]
+            self._salary_bounds = rows, self.table.salary_from[rows], np.sort(self.table.salary_to[rows])
+        return self._salary_bounds
+
+    def lookup_salaries(self, salary_from: float, salary_to: float):
+        """Находит вакансии, вилка оклада которых пересекается с диапазоном: это вилки, содержащие его левую
+        границу, и вилки, начинающиеся внутри диапазона. Диапазон, заданный в обратном порядке, переворачивается
+        Args:
+            salary_from (float): Нижняя граница диапазона
+            salary_to (float): Верхняя граница диапазона
+        Returns:
+            (np.ndarray): Отсортированный массив номеров строк
+        """
+        salary_from, salary_to = min(salary_from, salary_to), max(salary_from, salary_to)
+        rows, starts, ends = self.salary_bounds
+        inside = rows[np.searchsorted(starts, salary_from, 'right'):np.searchsorted(starts, salary_to, 'right')]
+        return np.union1d(self.salaries.stab(salary_from), inside)
+
+    def count_salaries(self, values):
+        """Считает для каждого оклада число вакансий, в вилку которых он попадает. Число вилок, содержащих
+        точку, равно числу левых границ не больше точки минус число правых границ меньше точки, поэтому
+        ответ на m окладов считается двумя бинарными поисками по отсортированным границам
+        Args:
+            values: Оклады
+        Returns:
+            (np.ndarray): Число вакансий для каждого оклада
+        """
+        rows, starts, ends = self.salary_bounds
+        values = np.asarray(values, float)
+        return np.searchsorted(starts, values, 'right') - np.searchsorted(ends, values, 'left')
+
+    @staticmethod
+    def group(codes: np.ndarray, values: list):
+        """Группирует номера строк по кодам значений
+        Args:
+            codes (np.ndarray): Коды значений для каждой строки
+            values (list): Значения, номер значения равен его коду
+        Returns:
+            (dict): Словарь со значениями и отсортированными массивами номеров строк
+        """
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(values) + 1))
+        return {value: order[bounds[i]:bounds[i + 1]] for i, value in enumerate(values)}
+
+    def build(self, field: str):
+        """Строит индекс по полю, значения в индексе хранятся в том виде, в котором их вводит пользователь
+        Args:
+            field (str): Название поля таблицы
+        Returns:
+            (dict): Словарь со значениями поля и отсортированными массивами номеров строк
+        """
+        table = self.table
+        if field in VacancyTable.encoded_columns:
+            return self.group(getattr(table, field), table.display_values(field))
+        if field == "premium":
+            return self.group(table.premium.astype(np.int8), [bools["False"], bools["True"]])
+        if field == "key_skills":
+            skills = dict()
+            for i, key_skills in enumerate(table.key_skills):
+                for skill in set(key_skills.split(';;')):
+                    skills.setdefault(skill, array('q')).append(i)
+            return {skill: np.frombuffer(rows, np.int64) for skill, rows in skills.items()}
+        values, codes = np.unique(np.array([f"{x[8:10]}.{x[5:7]}.{x[:4]}" for x in table.published_at], object),
+                                  return_inverse=True)
+        return self.group(codes, list(values))
+
+    def field_postings(self, field: str):
+        """Возвращает индекс по полю, строя его при первом запросе
+        Args:
+            field (str): Название поля таблицы
+        Returns:
+            (dict): Словарь со значениями поля и отсортированными массивами номеров строк
+        """
+        if field not in self.postings:
+            self.postings[field] = self.build(field)
+        return self.postings[field]
+
+    def lookup(self, field: str, value: str):
+        """Находит строки, в которых поле равно значению
+        Args:
+            field (str): Название поля таблицы
+            value (str): Значение в том виде, в котором его вводит пользователь
+        Returns:
+            (np.ndarray): Отсортированный массив номеров строк
+        """
+        return self.field_postings(field).get(value, np.zeros(0, np.int64))
+
+    def lookup_all(self, field: str, values: list):
+        """Находит строки, в которых поле содержит все значения
+        Args:
+            field (str): Название поля таблицы
+            values (list): Список значений
+        Returns:
+            (np.ndarray): Отсортированный массив номеров строк
+        """
+        return self.intersect([self.lookup(field, value) for value in values])
+
+    def lookup_dates(self, date_from: str, date_to: str):
+        """Находит вакансии, опубликованные в диапазоне дат включительно
+        Args:
+            date_from (str): Первая дата диапазона в формате дд.мм.гггг
+            date_to (str): Последняя дата диапазона в формате дд.мм.гггг
+        Returns:
+            (np.ndarray): Отсортированный массив номеров строк
+        """
+        date_from, date_to = date_from[6:] + date_from[3:5] + date_from[:2], date_to[6:] + date_to[3:5] + date_to[:2]
+        return np.sort(np.concatenate([np.zeros(0, np.int64)] + [
+            rows for date, rows in self.field_postings("published_at").items()
+            if date_from <= date[6:] + date[3:5] + date[:2] <= date_to]))
+
+    def filter(self, plan: list):
+        """Находит строки, подходящие под разобранное выражение фильтрации. Каждое условие отвечает по индексу,
+        условия внутри варианта пересекаются, варианты объединяются
+        Args:
+            plan (list): Выражение фильтрации, разобранное функцией parse_filter
+        Returns:
+            (np.ndarray): Отсортированный массив номеров строк
+        """
+        result = np.zeros(0, np.int64)
+        for conjunction in plan:
+            rows = self.intersect([functions_for_filter[key](self, value) for key, value in conjunction])
+            result = np.union1d(result, rows)
+        return result
+
+    @staticmethod
+    def intersect(rows: list):
+        """Пересекает отсортированные массивы номеров строк, начиная с самого короткого
+        Args:
+            rows (list): Список отсортированных массивов номеров строк
+        Returns:
+            (np.ndarray): Отсортированный массив номеров строк
+        """
+        rows = sorted(rows, key=len)
+        result = rows[0]
+        for other in rows[1:]:
+            result = np.intersect1d(result, other, assume_unique=True)
+        return result
+
+
+class AhoCorasick(object):
+    """Автомат Ахо-Корасик для поиска сразу всех подстрок из списка за один проход по тексту
+    Attributes:
+        goto (list): Переходы бора, для каждой вершины словарь из символа в номер вершины
+        fail (list): Суффиксные ссылки вершин
+        output (list): Номера подстрок, которые заканчиваются в вершине, с учётом суффиксных ссылок
+    """
+
+    def __init__(self, patterns: list):
+        """Строит автомат по списку подстрок
+        Args:
+            patterns (list): Список подстрок, номер подстроки равен её индексу в списке
+        """
+        self.goto = [dict()]
+        self.output = [[]]
+        for i, pattern in enumerate(patterns):
+            node = 0
+            for char in pattern:
+                if char not in self.goto[node]:
+                    self.goto.append(dict())
+                    self.output.append([])
+                    self.goto[node][char] = len(self.goto) - 1
+                node = self.goto[node][char]
+            self.output[node].append(i)
+        self.fail = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                fail = self.fail[node]
+                while fail and char not in self.goto[fail]:
+                    fail = self.fail[fail]
+                self.fail[child] = self.goto[fail].get(char, 0) if node else 0
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+                queue.append(child)
+
+    def search(self, text: str):
+        """Находит все подстроки из списка, которые встречаются в тексте
+        Args:
+            text (str): Текст
+        Returns:
+            (set): Номера найденных подстрок
+        """
+        found = set(self.output[0])
+        node = 0
+        for char in text:
+            while node and char not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(char, 0)
+            if self.output[node]:
+                found.update(self.output[node])
+        return found
+
+
+class AnalyzeSet(object):
+    """Групповые суммы для анализа вакансий: количество вакансий и сумма зарплат по годам и по регионам.
+    Суммы, посчитанные по разным частям данных, складываются методом merge
+    Attributes:
+        job_names (list): Названия профессий
+        job_name (str): Название первой профессии, None если профессий нет
+        vacancies_number (int): Количество вакансий
+        years (list): Годы в порядке их первого появления в данных
+        number_by_years (np.ndarray): Количество вакансий по годам
+        salary_by_years (np.ndarray): Сумма зарплат по годам
+        number_by_years_jobs (np.ndarray): Количество вакансий по профессиям (строки) и годам (столбцы)
+        salary_by_years_jobs (np.ndarray): Сумма зарплат по профессиям (строки) и годам (столбцы)
+        number_by_years_job (np.ndarray): Количество вакансий по годам, по первой профессии
+        salary_by_years_job (np.ndarray): Сумма зарплат по годам, по первой профессии
+        areas (list): Регионы в порядке их первого появления в данных
+        number_by_area (np.ndarray): Количество вакансий по регионам
+        salary_by_area (np.ndarray): Сумма зарплат по регионам
+        files (list): Отпечатки файлов, суммы по которым уже добавлены
+    """
+
+    def __init__(self, job_name):
+        """Инициализирует пустой объект AnalyzeSet
+        Args:
+            job_name (str или list): Название профессии или список названий профессий
+        """
+        self.job_names = [job_name] if isinstance(job_name, str) else list(job_name)
+        self.job_name = self.job_names[0] if self.job_names else None
+        self.vacancies_number = 0
+        self.years = []
+        self.number_by_years = np.zeros(0, np.int64)
+        self.salary_by_years = np.zeros(0, np.float64)
+        self.number_by_years_jobs = np.zeros((len(self.job_names), 0), np.int64)
+        self.salary_by_years_jobs = np.zeros((len(self.job_names), 0), np.float64)
+        self.areas = []
+        self.number_by_area = np.zeros(0, np.int64)
+        self.salary_by_area = np.zeros(0, np.float64)
+        self.files = []
+
+    def save(self, state_name: str):
+        """Сохраняет групповые суммы в json файл, чтобы потом добавлять к ним суммы по новым файлам. Файл сначала
+        пишется во временный и только потом заменяет старый, чтобы прерванная запись не испортила статистику
+        Args:
+            state_name (str): Путь к файлу статистики
+        """
+        state = {"version": 1, "files": self.files, "job_names": self.job_names,
+                 "vacancies_number": self.vacancies_number, "years": self.years, "areas": self.areas}
+        for attribute in ["number_by_years", "salary_by_years", "number_by_years_jobs", "salary_by_years_jobs",
+                          "number_by_area", "salary_by_area"]:
+            state[attribute] = getattr(self, attribute).tolist()
+        with open(f"{state_name}.tmp", 'w', encoding='utf-8') as file:
+            json.dump(state, file, ensure_ascii=False)
+        os.replace(f"{state_name}.tmp", state_name)
+
+    @classmethod
+    def load(cls, state_name: str):
+        """Читает групповые суммы, сохранённые методом save
+        Args:
+            state_name (str): Путь к файлу статистики
+        Returns:
+            (AnalyzeSet): Групповые суммы или None, если файла нет или он в другом формате
+        """
+        try:
+            with open(state_name, encoding='utf-8') as file:
+                state = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if state.get("version") != 1:
+            return None
+        analyze_set = cls(state["job_names"])
+        analyze_set.files = state["files"]
+        analyze_set.vacancies_number = state["vacancies_number"]
+        analyze_set.years = state["years"]
+        analyze_set.areas = state["areas"]
+        analyze_set.number_by_years = np.array(state["number_by_years"], np.int64)
+        analyze_set.salary_by_years = np.array(state["salary_by_years"], np.float64)
+        shape = (len(analyze_set.job_names), len(analyze_set.years))
+        analyze_set.number_by_years_jobs = np.array(state["number_by_years_jobs"], np.int64).reshape(shape)
+        analyze_set.salary_by_years_jobs = np.array(state["salary_by_years_jobs"], np.float64).reshape(shape)
+        analyze_set.number_by_area = np.array(state["number_by_area"], np.int64)
+        analyze_set.salary_by_area = np.array(state["salary_by_area"], np.float64)
+        return analyze_set
+
+    @property
+    def number_by_years_job(self):
+        return self.number_by_years_jobs[0]
+
+    @property
+    def salary_by_years_job(self):
+        return self.salary_by_years_jobs[0]
+
+    @staticmethod
+    def match_jobs(names: list, codes: np.ndarray, job_names: list):
+        """Находит пары (профессия, строка), в которых название вакансии содержит название профессии. Названия
+        проверяются по одному разу на каждое различное название, результат раскладывается по строкам через коды.
+        Одна профессия ищется через str.find, несколько - автоматом Ахо-Корасик за один проход по каждому названию
+        Args:
+            names (list): Различные названия вакансий, номер названия равен его коду
+            codes (np.ndarray): Коды названий вакансий по строкам
+            job_names (list): Названия профессий
+        Returns:
+            (tuple): Номера профессий и номера строк найденных пар
+        """
+        if len(job_names) == 1:
+            is_job = np.fromiter((x.find(job_names[0]) >= 0 for x in names), bool, len(names))
+            rows = np.flatnonzero(is_job[codes])
+            return np.zeros(len(rows), np.int64), rows
+        automaton = AhoCorasick(job_names)
+        jobs, matched = array('q'), array('q')
+        for code, name in enumerate(names):
+            for job in automaton.search(name):
+                jobs.append(job)
+                matched.append(code)
+        jobs, matched = np.frombuffer(jobs, np.int64), np.frombuffer(matched, np.int64)
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(names) + 1))
+        lengths = bounds[matched + 1] - bounds[matched]
+        offsets = np.repeat(bounds[matched] - np.cumsum(lengths) + lengths, lengths)
+        return np.repeat(jobs, lengths), order[offsets + np.arange(lengths.sum())]
+
+    @classmethod
+    def from_table(cls, table: VacancyTable, job_name):
+        """Считает все групповые суммы за один проход по столбцам таблицы, группируя строки по кодам года и региона
+        Args:
+            table (VacancyTable): Таблица вакансий
+            job_name (str или list): Название профессии или список названий профессий
+        Returns:
+            (AnalyzeSet): Групповые суммы по таблице
+        """
+        analyze_set = cls(job_name)
+        years, first_indices, year_codes = np.unique(table.year, return_index=True, return_inverse=True)
+        appearance = np.argsort(first_indices)
+        year_codes = np.argsort(appearance)[year_codes]
+        jobs, rows = cls.match_jobs(table.dictionaries["name"], table.name, analyze_set.job_names)
+        job_year_codes = jobs * len(years) + year_codes[rows]
+        shape = (len(analyze_set.job_names), len(years))
+        salary = table.mid_salary_in_rubles
+        analyze_set.vacancies_number = len(table)
+        analyze_set.years = [int(x) for x in years[appearance]]
+        analyze_set.number_by_years = np.bincount(year_codes, minlength=len(years))
+        analyze_set.salary_by_years = np.bincount(year_codes, salary, len(years))
+        analyze_set.number_by_years_jobs = np.bincount(job_year_codes, minlength=shape[0] * shape[1]).reshape(shape)
+        analyze_set.salary_by_years_jobs = np.bincount(job_year_codes, salary[rows], shape[0] * shape[1]).reshape(shape)
+        analyze_set.areas = list(table.dictionaries["area_name"])
+        analyze_set.number_by_area = np.bincount(table.area_name, minlength=len(analyze_set.areas))
+        analyze_set.salary_by_area = np.bincount(table.area_name, salary, len(analyze_set.areas))
+        return analyze_set
+
+    @staticmethod
+    def aligned(keys: list, values: np.ndarray, all_keys: list):
+        """Раскладывает групповые суммы по новому, более полному списку групп, группы - последняя ось массива
+        Args:
+            keys (list): Текущий список групп
+            values (np.ndarray): Суммы по текущему списку групп
+            all_keys (list): Новый список групп, который содержит все текущие группы
+        Returns:
+            (np.ndarray): Суммы по новому списку групп
+        """
+        index = {key: i for i, key in enumerate(all_keys)}
+        result = np.zeros(values.shape[:-1] + (len(all_keys),), values.dtype)
+        result[..., [index[key] for key in keys]] = values
+        return result
+
+    def merge(self, other):
+        """Добавляет к текущим групповым суммам суммы, посчитанные по другой части данных
+        Args:
+            other (AnalyzeSet): Групповые суммы по другой части данных
+        Raises:
+            ValueError: Суммы посчитаны по другим профессиям или в другом порядке профессий
+        """
+        if self.job_names != other.job_names:
+            raise ValueError(f"Профессии не совпадают: {self.job_names} и {other.job_names}")
+        years = self.years + [x for x in other.years if x not in set(self.years)]
+        areas = self.areas + [x for x in other.areas if x not in set(self.areas)]
+        for attribute, keys, other_keys, all_keys in [("number_by_years", self.years, other.years, years),
+                                                      ("salary_by_years", self.years, other.years, years),
+                                                      ("number_by_years_jobs", self.years, other.years, years),
+                                                      ("salary_by_years_jobs", self.years, other.years, years),
+                                                      ("number_by_area", self.areas, other.areas, areas),
+                                                      ("salary_by_area", self.areas, other.areas, areas)]:
+            setattr(self, attribute, self.aligned(keys, getattr(self, attribute), all_keys) +
+                    self.aligned(other_keys, getattr(other, attribute), all_keys))
+        self.years = years
+        self.areas = areas
+        self.vacancies_number += other.vacancies_number
+        self.files += other.files
+
+    @staticmethod
+    def average(salaries: np.ndarray, numbers: np.ndarray):
+        """Делит суммы зарплат на количество вакансий с отбрасыванием дробной части, пустые группы дают 0
+        Args:
+            salaries (np.ndarray): Суммы зарплат
+            numbers (np.ndarray): Количество вакансий
+        Returns:
+            (list): Средние зарплаты
+        """
+        return [int(x) for x in np.trunc(np.divide(salaries, numbers, out=np.zeros(len(numbers)), where=numbers != 0))]
+
+    def to_dicts(self, job_name=None):
+        """Преобразует групповые суммы в словари анализа: средние зарплаты, регионы с долей вакансий от 1%,
+        отсортированные по убыванию и обрезанные до 10 штук
+        Args:
+            job_name (str): Название профессии для словарей по выбранной профессии, по умолчанию первая профессия
+        Returns:
+            (tuple): salary_by_years, number_by_years, salary_by_years_job, number_by_years_job, salary_by_area,
+                share_number_by_area
+        """
+        salary_by_area = np.array(self.average(self.salary_by_area, self.number_by_area), np.int64)
+        share_number_by_area = np.array([round(int(x) / self.vacancies_number, 4) for x in self.number_by_area])
+        is_big = share_number_by_area >= 0.01
+        areas = np.array(self.areas, object)[is_big]
+        salary_by_area, share_number_by_area = salary_by_area[is_big], share_number_by_area[is_big]
+        top_salary = stable_argsort(salary_by_area, True)[:10]
+        top_share = stable_argsort(share_number_by_area, True)[:10]
+        salary_by_years_jobs, number_by_years_jobs = self.jobs_to_dicts()
+        job_name = self.job_name if job_name is None else job_name
+        return (dict(zip(self.years, self.average(self.salary_by_years, self.number_by_years))),
+                dict(zip(self.years, [int(x) for x in self.number_by_years])),
+                salary_by_years_jobs[job_name],
+                number_by_years_jobs[job_name],
+                {areas[i]: int(salary_by_area[i]) for i in top_salary},
+                {areas[i]: float(share_number_by_area[i]) for i in top_share})
+
+    def jobs_to_dicts(self):
+        """Преобразует групповые суммы по профессиям в словари анализа
+        Returns:
+            (tuple): Словари из названия профессии в словари средних зарплат и количества вакансий по годам
+        """
+        return ({job_name: dict(zip(self.years, self.average(salaries, numbers)))
+                 for job_name, salaries, numbers in zip(self.job_names, self.salary_by_years_jobs,
+                                                        self.number_by_years_jobs)},
+                {job_name: dict(zip(self.years, [int(x) for x in numbers]))
+                 for job_name, numbers in zip(self.job_names, self.number_by_years_jobs)})
+
+
 class DataSet(object):
     """Класс, который преобразует csv файл в базу данных информации о вакансиях, и анализирует эту информацию
     Attributes:
-        file_name (str):
-        vacancies_objects (list): Список, хранящий вакансии в виде объекта Vacancy
+        file_name (str): Имя файла
+        processes (int): Количество процессов для анализа большого файла по частям
+        cache_name (str): Путь к папке кэша таблицы, None если кэш не используется
+        table (VacancyTable): Колоночная таблица вакансий, читается из файла при первом обращении
+        index (VacancyIndex): Индексы по таблице вакансий для фильтрации
+        order (np.ndarray): Номера строк таблицы в порядке сортировки, None если сортировки не было
+        sorted_by (frozenset): Параметры, по которым отсортирован order, если он получен сортировкой исходного
+            порядка строк по этим параметрам, None если порядок получен последовательными сортировками
+        sort_keys (dict): Посчитанные ключи сортировки по параметрам
+        sort_ranks (dict): Посчитанные плотные ранги ключей сортировки по параметрам
+        permutations (dict): Посчитанные перестановки строк таблицы для сортировок по кортежам из parse_sort
+        vacancies_objects (VacancyView): Ленивый список, хранящий вакансии в виде объекта Vacancy
         vacancies_number (int): Количество вакансий
+        analyze_set (AnalyzeSet): Групповые суммы для анализа
         salary_by_years (dict): Словарь с зарплатами по годам
         number_by_years (dict): Словарь с количеством вакансий по годам
         salary_by_years_job (dict): Словарь с зарплатами по годам, по выбранной профессии
         number_by_years_job (dict): Словарь с количеством вакансий по годам, по выбранной профессии
+        salary_by_years_jobs (dict): Словари с зарплатами по годам для каждой профессии
+        number_by_years_jobs (dict): Словари с количеством вакансий по годам для каждой профессии
         salary_by_area (dict): Словарь с зарплатами по регионам
         share_number_by_area (dict): Словарь с количеством зарплат по регионам
     """
 
-    def __init__(self, file_name: str):
-        """Инициализирует объект DataSet, преобразует файл с вакансиями в список вакансий
+    min_range_size = 1 << 22
+
+    def __init__(self, file_name: str, processes=1, use_cache=False):
+        """Инициализирует объект DataSet, файл с вакансиями читается в таблицу при первом обращении к ней
         Args:
             file_name: Имя файла
+            processes (int): Количество процессов для анализа большого файла по частям, по умолчанию 1
+            use_cache (bool): Атрибут, указывающий на необходимость читать и сохранять кэш таблицы рядом с файлом,
+                по умолчанию False
         """
         self.file_name = file_name
-        self.vacancies_objects = [Vacancy(x) for x in self.file_to_rows()]
-        self.vacancies_number = len(self.vacancies_objects)
+        self.processes = processes
+        self.cache_name = f"{file_name}.cache" if use_cache else None
+        self._table = None
+        self._index = None
+        self.order = None
+        self.sorted_by = frozenset()
+        self.sort_keys = dict()
+        self.sort_ranks = dict()
+        self.permutations = dict()
+        self.analyze_set = None
         self.salary_by_years = dict()
         self.number_by_years = dict()
         self.salary_by_years_job = dict()
         self.number_by_years_job = dict()
+        self.salary_by_years_jobs = dict()
+        self.number_by_years_jobs = dict()
         self.salary_by_area = dict()
         self.share_number_by_area = dict()
 
-    def analyze(self, job_name: str):
-        """Анализирует вакансии по названию профессии
+    @property
+    def table(self):
+        """Колоночная таблица вакансий, которая потоково собирается из файла при первом обращении к ней
+        Returns:
+            (VacancyTable): Таблица вакансий
+        """
+        if self._table is None:
+            self._table = self.load_cache()
+        if self._table is None:
+            fingerprint = file_fingerprint(self.file_name)
+            self._table = VacancyTable.from_rows(self.file_to_rows())
+            self.save_cache(fingerprint)
+        return self._table
+
+    def load_cache(self):
+        """Открывает таблицу из кэша, если он построен по текущей версии файла
+        Returns:
+            (VacancyTable): Таблица вакансий или None
+        """
+        if self.cache_name is None:
+            return None
+        return VacancyTable.load(self.cache_name, file_fingerprint(self.file_name))
+
+    def save_cache(self, fingerprint: dict):
+        """Сохраняет таблицу в кэш, ошибки записи не мешают работе программы
         Args:
-            job_name (str): Название профессии
+            fingerprint (dict): Отпечаток файла, снятый до начала его чтения
+        """
+        if self.cache_name is None:
+            return
+        try:
+            self._table.save(self.cache_name, fingerprint)
+        except OSError:
+            pass
+
+    @property
+    def index(self):
+        """Индексы для фильтрации, которые строятся один раз для DataSet
+        Returns:
+            (VacancyIndex): Индексы по таблице вакансий
+        """
+        if self._index is None:
+            self._index = VacancyIndex(self.table)
+        return self._index
+
+    @property
+    def vacancies_objects(self):
+        """Вакансии в текущем порядке сортировки, объекты Vacancy создаются только при обращении к ним
+        Returns:
+            (VacancyView): Ленивый список вакансий
+        """
+        return VacancyView(self.table, self.order)
+
+    @property
+    def vacancies_number(self):
+        """Количество вакансий
+        Returns:
+            (int): Количество вакансий
+        """
+        return len(self.table)
+
+    def analyze(self, job_name):
+        """Анализирует вакансии по названию профессии или сразу по нескольким профессиям за один проход
+        Args:
+            job_name (str или list): Название профессии или список названий профессий
         """
         self.fill_analyze_set(job_name)
 
-        self.edit_analyze_set()
+        self.edit_analyze_set(job_name if isinstance(job_name, str) else None)
 
-        self.print_analyze()
+        self.print_analyze(isinstance(job_name, str))
 
-    def print_analyze(self):
+    def print_analyze(self, only_selected_job=False):
         """Печатает в консоль данные с проведённого анализа вакансий
+        Args:
+            only_selected_job (bool): Не печатать статистику по остальным профессиям, посчитанным заранее,
+                например в пакетном режиме по всем профессиям из заданий
         """
         print(f"Динамика уровня зарплат по годам: {self.salary_by_years}")
         print(f"Динамика количества вакансий по годам: {self.number_by_years}")
@@ -240,64 +1353,109 @@ class DataSet(object):
         print(f"Динамика количества вакансий по годам для выбранной профессии: {self.number_by_years_job}")
         print(f"Уровень зарплат по городам (в порядке убывания): {self.salary_by_area}")
         print(f"Доля вакансий по городам (в порядке убывания): {self.share_number_by_area}")
+        if len(self.salary_by_years_jobs) > 1 and not only_selected_job:
+            for job_name in self.salary_by_years_jobs.keys():
+                print(f"Динамика уровня зарплат по годам для профессии {job_name}: "
+                      f"{self.salary_by_years_jobs[job_name]}")
+                print(f"Динамика количества вакансий по годам для профессии {job_name}: "
+                      f"{self.number_by_years_jobs[job_name]}")
 
-    def fill_analyze_set(self, job_name: str):
-        """Заполняет словари для анализа данными, которые потребуются для анализа
-        Args:
-            job_name (str): Название профессии
-        """
-        for vac in self.vacancies_objects:
-            if vac.year not in self.number_by_years:
-                self.number_by_years_job[vac.year] = 0
-                self.salary_by_years_job[vac.year] = 0
-                self.number_by_years[vac.year] = 0
-                self.salary_by_years[vac.year] = 0
-            if vac.area_name not in self.salary_by_area:
-                self.share_number_by_area[vac.area_name] = 0
-                self.salary_by_area[vac.area_name] = 0
-
-            self.number_by_years[vac.year] = self.number_by_years[vac.year] + 1
-            self.salary_by_years[vac.year] = self.salary_by_years[vac.year] + vac.salary.mid_salary_in_rubles
-            self.share_number_by_area[vac.area_name] = self.share_number_by_area[vac.area_name] + 1
-            self.salary_by_area[vac.area_name] = self.salary_by_area[vac.area_name] + vac.salary.mid_salary_in_rubles
-
-            if vac.name.find(job_name) >= 0:
-                self.number_by_years_job[vac.year] = self.number_by_years_job[vac.year] + 1
-                self.salary_by_years_job[vac.year] = self.salary_by_years_job[
-                                                         vac.year] + vac.salary.mid_salary_in_rubles
-
-    def edit_analyze_set(self):
-        """Редактирует словари для анализа данных, изменяя текущие данные под конечные, готовые к работе
-        """
-        for key in self.salary_by_years.keys():
-            self.salary_by_years[key] = int(self.salary_by_years[key] / self.number_by_years[key]) if \
-                self.number_by_years[key] != 0 else 0
-        for key in self.salary_by_years_job.keys():
-            self.salary_by_years_job[key] = int(self.salary_by_years_job[key] / self.number_by_years_job[key]) if \
-                self.number_by_years_job[key] != 0 else 0
-
-        areas = []
-        for key in self.salary_by_area.keys():
-            self.salary_by_area[key] = int(self.salary_by_area[key] / self.share_number_by_area[key])
-            self.share_number_by_area[key] = round(self.share_number_by_area[key] / self.vacancies_number, 4)
-            if self.share_number_by_area[key] < 0.01:
-                areas.append(key)
-        for key in areas:
-            del self.salary_by_area[key]
-            del self.share_number_by_area[key]
-
-        self.salary_by_area = dict(sorted(self.salary_by_area.items(), key=lambda x: x[1], reverse=True)[:10])
-        self.share_number_by_area = dict(
-            sorted(self.share_number_by_area.items(), key=lambda x: x[1], reverse=True)[:10])
+    def fill_analyze_set(self, job_name):
+        """Считает групповые суммы, которые потребуются для анализа. Если суммы по всем нужным профессиям уже
+        посчитаны, например заранее по списку профессий, они не пересчитываются
+        Args:
+            job_name (str или list): Название профессии или список названий профессий
+        """
+        job_names = [job_name] if isinstance(job_name, str) else job_name
+        if self.analyze_set is not None and all(x in self.analyze_set.job_names for x in job_names):
+            return
+        if self._table is None:
+            self._table = self.load_cache()
+        if self._table is None and self.processes > 1:
+            self.analyze_set = self.parallel_analyze_set(job_name)
+        else:
+            self.analyze_set = AnalyzeSet.from_table(self.table, job_name)
+
+    def load_analyze_state(self, state_name: str):
+        """Берёт групповые суммы для анализа из сохранённой статистики, не читая файл с вакансиями
+        Args:
+            state_name (str): Путь к файлу статистики
+        """
+        self.analyze_set = AnalyzeSet.load(state_name)
+        if self.analyze_set is None:
+            print("Сохранённая статистика не найдена")
+            quit()
+
+    def update_analyze_state(self, state_name: str, job_name):
+        """Добавляет групповые суммы по файлу к сохранённой статистике и сохраняет её. Файл, который уже был добавлен,
+        повторно не считается, поэтому время обновления зависит только от размера нового файла. После обновления
+        анализ строится по всей накопленной статистике
+        Args:
+            state_name (str): Путь к файлу статистики, если его нет - статистика начинается с этого файла
+            job_name (str или list): Название профессии или список названий профессий
+        """
+        job_names = [job_name] if isinstance(job_name, str) else list(job_name)
+        state = AnalyzeSet.load(state_name) or AnalyzeSet(job_names)
+        if not all(x in state.job_names for x in job_names):
+            print("Профессии нет в сохранённой статистике")
+            quit()
+        fingerprint = file_fingerprint(self.file_name)
+        if fingerprint not in state.files:
+            if self.analyze_set is None or self.analyze_set.job_names != state.job_names:
+                self.analyze_set = None
+                self.fill_analyze_set(state.job_names)
+            state.merge(self.analyze_set)
+            state.files.append(fingerprint)
+            state.save(state_name)
+        self.analyze_set = state
+
+    def parallel_analyze_set(self, job_name):
+        """Делит файл на части, разбирает и считает групповые суммы по каждой части в отдельном процессе,
+        после чего складывает суммы в порядке частей. Если используется кэш, таблицы частей склеиваются и сохраняются
+        Args:
+            job_name (str или list): Название профессии или список названий профессий
+        Returns:
+            (AnalyzeSet): Групповые суммы по всему файлу
+        """
+        fingerprint = file_fingerprint(self.file_name)
+        with open(self.file_name, encoding='utf-8-sig') as r_file:
+            file = csv.reader(r_file)
+            header = next(file, None)
+            self.check_file_for_empty(header, next(file, None))
+        parts = max(1, min(self.processes, os.path.getsize(self.file_name) // self.min_range_size))
+        tasks = [(self.file_name, header, start, end, job_name, self.cache_name is not None)
+                 for start, end in split_file(self.file_name, parts)]
+        if len(tasks) == 1:
+            results = [analyze_file_range(*tasks[0])]
+        else:
+            with multiprocessing.Pool(len(tasks)) as pool:
+                results = pool.starmap(analyze_file_range, tasks)
+        analyze_set = AnalyzeSet(job_name)
+        for result in results:
+            analyze_set.merge(result if self.cache_name is None else result[0])
+        if self.cache_name is not None:
+            self._table = VacancyTable.concat([table for _, table in results])
+            self.save_cache(fingerprint)
+        return analyze_set
+
+    def edit_analyze_set(self, job_name=None):
+        """Заполняет словари для анализа данных из групповых сумм, изменяя их под конечные, готовые к работе
+        Args:
+            job_name (str): Название профессии для словарей по выбранной профессии, по умолчанию первая профессия
+        """
+        (self.salary_by_years, self.number_by_years, self.salary_by_years_job, self.number_by_years_job,
+         self.salary_by_area, self.share_number_by_area) = self.analyze_set.to_dicts(job_name)
+        self.salary_by_years_jobs, self.number_by_years_jobs = self.analyze_set.jobs_to_dicts()
 
     @staticmethod
-    def check_file_for_empty(len: int):
-        """Проверяет входной файл на пустоту или отсутствия данных
+    def check_file_for_empty(header, first_row):
+        """Проверяет входной файл на пустоту или отсутствия данных, не дочитывая файл до конца
         Args:
-            len (int): Принимает на вход одну переменную типа int, длину массива данных из таблицы
+            header (list или None): Строка с названиями столбцов, None если файл пустой
+            first_row (list или None): Первая строка с данными после заголовка, None если данных нет
         """
-        if len < 2:
-            print("Пустой файл" if len < 1 else "Нет данных")
+        if header is None or first_row is None:
+            print("Пустой файл" if header is None else "Нет данных")
             quit()
 
     @staticmethod
@@ -309,50 +1467,178 @@ class DataSet(object):
             (str): Строка без html тэгов, лишних пробелов и переносов
         """
         s = s.replace('\n', ';;')
-        return ' '.join(re.sub("<[^>]*>", "", s).split())
+        if '<' in s:
+            s = html_tags.sub("", s)
+        return ' '.join(s.split())
 
     def file_to_rows(self):
-        """Извлекает данные из csv таблицы и преобразует их в список словарей, подходящих для преобразования в объект Vacancy
-        Returns (list): Список словарей
-        """
-        r_file = open(self.file_name, encoding='utf-8-sig')
-        file = csv.reader(r_file)
-        text = [x for x in file]
-        self.check_file_for_empty(len(text))
-        vacancy = text[0]
-        r_file.close()
-        return [dict(zip(vacancy, [self.change_string(s) for s in x if s])) for x in text[1:] if
-                len([value for value in x if value]) == len(vacancy)]
+        """Построчно извлекает данные из csv таблицы и отдаёт словари, подходящие для преобразования в объект Vacancy
+        Returns (generator): Генератор словарей
+        """
+        with open(self.file_name, encoding='utf-8-sig') as r_file:
+            file = csv.reader(r_file)
+            vacancy = next(file, None)
+            first_row = next(file, None)
+            self.check_file_for_empty(vacancy, first_row)
+            yield from self.reader_to_rows(vacancy, chain([first_row], file))
+
+    @classmethod
+    def reader_to_rows(cls, vacancy: list, file):
+        """Отбрасывает строки с пропусками и преобразует остальные в словари, подходящие для объекта Vacancy.
+        Текстовые столбцы из text_columns очищаются полностью, у остальных столбцов только обрезаются пробелы по краям
+        Args:
+            vacancy (list): Названия столбцов таблицы
+            file: Итерируемый объект строк таблицы в виде списков
+        Returns (generator): Генератор словарей
+        """
+        cleaners = [cls.change_string if column in text_columns else str.strip for column in vacancy]
+        for x in file:
+            if len(x) - x.count('') == len(vacancy):
+                if len(x) != len(vacancy):
+                    x = [value for value in x if value]
+                yield {column: clean(s) for column, clean, s in zip(vacancy, cleaners, x)}
+
+    def sort_key(self, sort_param: str):
+        """Возвращает ключи сортировки всех строк таблицы, считая их один раз
+        Args:
+            sort_param (str): Параметр сортировки из словаря functions_for_sort
+        Returns:
+            (np.ndarray): Ключи сортировки
+        """
+        if sort_param not in self.sort_keys:
+            self.sort_keys[sort_param] = functions_for_sort[sort_param](self.table)
+        return self.sort_keys[sort_param]
+
+    def sort_rank(self, sort_param: str):
+        """Возвращает плотные ранги ключей сортировки: равные ключи получают равные ранги, порядок рангов
+        совпадает с порядком ключей
+        Args:
+            sort_param (str): Параметр сортировки из словаря functions_for_sort
+        Returns:
+            (np.ndarray): Ранги ключей сортировки
+        """
+        if sort_param not in self.sort_ranks:
+            self.sort_ranks[sort_param] = np.unique(self.sort_key(sort_param), return_inverse=True)[1].astype(np.int64)
+        return self.sort_ranks[sort_param]
+
+    def sort_indices(self, indices: np.ndarray, sort_spec: tuple):
+        """Устойчиво сортирует номера строк по нескольким параметрам
+        Args:
+            indices (np.ndarray): Номера строк таблицы в текущем порядке
+            sort_spec (tuple): Параметры сортировки, разобранные функцией parse_sort
+        Returns:
+            (np.ndarray): Отсортированные номера строк
+        """
+        if len(sort_spec) == 1:
+            return indices[stable_argsort(self.sort_key(sort_spec[0][0])[indices], sort_spec[0][1])]
+        ranks = [-self.sort_rank(param)[indices] if reverse else self.sort_rank(param)[indices]
+                 for param, reverse in reversed(sort_spec)]
+        return indices[np.lexsort(ranks)]
+
+    def reverse_blocks(self, permutation: np.ndarray, sort_spec: tuple):
+        """Переворачивает порядок групп строк с равными ключами, сохраняя порядок строк внутри групп. Так из
+        устойчивой сортировки получается устойчивая сортировка в обратном направлении за O(n)
+        Args:
+            permutation (np.ndarray): Номера строк, отсортированные по параметрам
+            sort_spec (tuple): Параметры сортировки, разобранные функцией parse_sort
+        Returns:
+            (np.ndarray): Номера строк, отсортированные по параметрам в обратном направлении
+        """
+        n = len(permutation)
+        change = np.zeros(n, bool)
+        change[:1] = True
+        for param, _ in sort_spec:
+            keys = self.sort_key(param)[permutation]
+            change[1:] |= keys[1:] != keys[:-1]
+        starts = np.flatnonzero(change)
+        ends = np.append(starts[1:], n)
+        blocks = np.cumsum(change) - 1
+        result = np.empty_like(permutation)
+        result[n - ends[blocks] + np.arange(n) - starts[blocks]] = permutation
+        return result
+
+    def permutation(self, sort_spec: tuple, cached_only=False):
+        """Возвращает перестановку всех строк таблицы для сортировки, запоминая её. Сортировка в обратном
+        направлении к уже посчитанной получается переворотом групп равных ключей
+        Args:
+            sort_spec (tuple): Параметры сортировки, разобранные функцией parse_sort
+            cached_only (bool): Атрибут, указывающий, что перестановку не нужно сортировать заново
+        Returns:
+            (np.ndarray): Номера строк в порядке сортировки, None если перестановки нет, а cached_only задан
+        """
+        if sort_spec not in self.permutations:
+            reverse_spec = tuple((param, not reverse) for param, reverse in sort_spec)
+            if reverse_spec in self.permutations:
+                self.permutations[sort_spec] = self.reverse_blocks(self.permutations[reverse_spec], sort_spec)
+            elif cached_only:
+                return None
+            else:
+                self.permutations[sort_spec] = self.sort_indices(np.arange(len(self.table)), sort_spec)
+        return self.permutations[sort_spec]
 
     def sort(self, sort_params: str, is_sort_reverse=False):
-        """Сортирует список вакансий по нужным требованиям
+        """Сортирует список вакансий по нужным требованиям, переставляя только номера строк таблицы. Если текущий
+        порядок получен сортировкой по части тех же параметров, результат совпадает с сортировкой исходного
+        порядка и берётся из запомненных перестановок
         Args:
-            sort_params (str): Параметры сортировки, которые должны быть реализованы в словаре functions_for_sort
+            sort_params (str): Параметры сортировки через запятую, каждый должен быть реализован в словаре
+                functions_for_sort, минус перед параметром меняет его направление
             is_sort_reverse (bool): Атрибут, который указывает на необходимость обратной сортировки
         """
-        self.vacancies_objects = sorted(self.vacancies_objects, key=functions_for_sort[sort_params],
-                                        reverse=is_sort_reverse)
+        sort_spec = parse_sort(sort_params, is_sort_reverse)
+        params = frozenset(param for param, _ in sort_spec)
+        if self.sorted_by is not None and self.sorted_by <= params:
+            self.order, self.sorted_by = self.permutation(sort_spec), params
+        else:
+            self.order, self.sorted_by = self.sort_indices(self.vacancies_objects.indices, sort_spec), None
 
-    def get_rows(self, need_filter: bool, filter_params):
-        """Преобразует список вакансий [Vacancy] в список списков [[]], содержащих данные о вакансии и фильтрует по параметру
+    def iter_rows(self, need_filter: bool, filter_params, sort_params=None, is_sort_reverse=False, start=0, end=None):
+        """Преобразует вакансии в списки, содержащие данные о вакансии, по одной при обращении, фильтрует по параметру
+        и сортирует. Сортируются и преобразуются только вакансии, попадающие в диапазон вывода [start, end)
         Args:
             need_filter (bool): Аргумент, указывающий на необходимость фильтрации
-            filter_params: Параметр фильтрации в виде списка из двух элементов, где первый параметр, а второй значение
+            filter_params: Параметр фильтрации в виде списка из двух элементов, где первый параметр, а второй значение,
+                или выражение фильтрации, разобранное функцией parse_filter
+            sort_params (str): Параметры сортировки как в методе sort, None если сортировка не нужна
+            is_sort_reverse (bool): Атрибут, который указывает на необходимость обратной сортировки
+            start (int): Номер первой выводимой вакансии, считая с нуля
+            end (int): Номер вакансии, перед которой вывод заканчивается, None если до конца
+        Returns:
+            (generator): Генератор вакансий в виде списков
+        """
+        indices = self.vacancies_objects.indices
+        mask = None
+        if need_filter:
+            plan = [[filter_params]] if isinstance(filter_params[0], str) else filter_params
+            mask = np.zeros(len(self.table), bool)
+            mask[self.index.filter(plan)] = True
+            indices = indices[mask[indices]]
+            if len(indices) < 1:
+                print("Ничего не найдено")
+                quit()
+        start, end, _ = slice(start, end).indices(len(indices))
+        if sort_params:
+            sort_spec = parse_sort(sort_params, is_sort_reverse)
+            permutation = None
+            if self.sorted_by is not None and self.sorted_by <= frozenset(param for param, _ in sort_spec):
+                permutation = self.permutation(sort_spec, cached_only=len(sort_spec) == 1)
+            if permutation is not None:
+                indices = permutation if mask is None else permutation[mask[permutation]]
+            elif len(sort_spec) == 1:
+                param, reverse = sort_spec[0]
+                indices = indices[top_k_argsort(self.sort_key(param)[indices], end, reverse)]
+            else:
+                indices = self.sort_indices(indices, sort_spec)
+        vacancies = VacancyView(self.table, indices[start:end])
+        for count, vacancy in enumerate(vacancies, start):
+            yield vacancy.get_row(count)
+
+    def get_rows(self, need_filter: bool, filter_params, sort_params=None, is_sort_reverse=False, start=0, end=None):
+        """Преобразует список вакансий в список списков [[]], содержащих данные о вакансии, аргументы как у iter_rows
         Returns:
             (list): Список вакансий в виде списков
         """
-        rows = []
-        count = 0
-        for i in range(self.vacancies_number):
-            if need_filter:
-                if not functions_for_filter[filter_params[0]](self.vacancies_objects[i], filter_params[1]):
-                    continue
-            rows.append(self.vacancies_objects[i].get_row(count))
-            count += 1
-        if need_filter and len(rows) < 1:
-            print("Ничего не найдено")
-            quit()
-        return rows
+        return list(self.iter_rows(need_filter, filter_params, sort_params, is_sort_reverse, start, end))
 
 
 class Report(object):
@@ -360,6 +1646,7 @@ class Report(object):
     Attributes:
         job_name (str): Название профессии для анализа
         data_set (DataSet): База данных по вакансиям
+        output_dir (str): Папка, в которую сохраняются изображение, таблица и pdf файл
         wb (Workbook): Таблица, которая преобразуется в .xlsx
         ws1 (WorkSheet): Первый лист таблицы
         ws2 (WorkSheet): Второй лист таблицы
@@ -367,14 +1654,19 @@ class Report(object):
         ax (~.axes.Axes): Список осей с анализом
     """
 
-    def __init__(self, file_name: str, job_name: str):
+    def __init__(self, file_name: str, job_name: str, data_set=None, output_dir='.'):
         """Инициализирует объект Report
         Args:
             file_name (str): Название файла с информацией о вакансиях
             job_name (str): Название профессии для анализа
+            data_set (DataSet): Уже прочитанная база данных по вакансиям, по умолчанию читается файл file_name с
+                кэшем таблицы рядом с ним
+            output_dir (str): Папка для сохранения отчётов, по умолчанию текущая
         """
         self.job_name = job_name
-        self.data_set = DataSet(file_name)
+        self.data_set = DataSet(file_name, multiprocessing.cpu_count(), use_cache=True) if data_set is None else \
+            data_set
+        self.output_dir = output_dir
         self.data_set.analyze(self.job_name)
         self.wb = Workbook()
         self.wb.active.title = "Статистика по годам"
@@ -444,7 +1736,12 @@ class Report(object):
         self.fig.tight_layout()
 
         # self.fig.show()
-        self.fig.savefig('graph.png')
+        self.fig.savefig(os.path.join(self.output_dir, 'graph.png'))
+
+    def close(self):
+        """Закрывает фигуру с графиками, чтобы она не занимала память, когда отчётов много
+        """
+        plt.close(self.fig)
 
     def generate_excel(self):
         """Генерирует и сохраняет таблицу в виде .xlsx файла с анализом
@@ -459,7 +1756,7 @@ class Report(object):
                 el.number_format = '0.00%'
         self.edit_cols_width(self.ws1)
         self.edit_cols_width(self.ws2)
-        self.wb.save("report.xlsx")
+        self.wb.save(os.path.join(self.output_dir, "report.xlsx"))
 
     def generate_pdf(self):
         """Генерирует и сохраняет pdf файл с изображением и таблицей с анализом
@@ -471,7 +1768,8 @@ class Report(object):
             {'name': self.job_name, 'headers1': tables[0], 'headers2': tables[1], 'rows1': tables[2],
              'rows2': tables[3]})
         config = pdfkit.configuration(wkhtmltopdf=r'D:\wkhtmltopdf\bin\wkhtmltopdf.exe')
-        pdfkit.from_string(pdf_template, 'report.pdf', configuration=config, options={"enable-local-file-access": ""})
+        pdfkit.from_string(pdf_template, os.path.join(self.output_dir, 'report.pdf'), configuration=config,
+                           options={"enable-local-file-access": ""})
 
     def analyze_to_rows_xlsx(self):
         """Преобразовывает словари с анализом из базы данных в строки для таблицы .xlsx
@@ -540,55 +1838,179 @@ class Report(object):
             ws.column_dimensions[col].width = value
 
 
+class TableWriter(object):
+    """Потоковый вывод таблицы в консоль с рамками вокруг каждой ячейки и выравниванием по левому краю,
+    как у PrettyTable(hrules=ALL, align="l"). Ширина столбцов считается по первым sample_size строкам и не больше
+    max_width, после этого строки печатаются по одной, не накапливаясь в памяти
+    Attributes:
+        field_names (list): Названия всех столбцов
+        max_width (int): Максимальная ширина столбца, более длинные строки переносятся
+        sample_size (int): Количество первых строк, по которым считается ширина столбцов
+        widths (list): Ширина каждого столбца
+    """
+
+    def __init__(self, field_names: list, max_width=20, sample_size=1000):
+        """Инициализирует объект TableWriter
+        Args:
+            field_names (list): Названия всех столбцов
+            max_width (int): Максимальная ширина столбца, по умолчанию 20
+            sample_size (int): Количество первых строк, по которым считается ширина столбцов, по умолчанию 1000
+        """
+        self.field_names = field_names
+        self.max_width = max_width
+        self.sample_size = sample_size
+        self.widths = [len(name) for name in field_names]
+
+    def fit(self, rows: list):
+        """Расширяет столбцы под значения строк, но не больше max_width
+        Args:
+            rows (list): Строки таблицы
+        """
+        for row in rows:
+            for i, value in enumerate(row):
+                width = max(len(line) for line in str(value).expandtabs().split('\n'))
+                self.widths[i] = max(self.widths[i], min(width, self.max_width))
+
+    def wrap(self, value, width: int):
+        """Разбивает значение ячейки на строки не длиннее ширины столбца
+        Args:
+            value: Значение ячейки
+            width (int): Ширина столбца
+        Returns:
+            (list): Строки ячейки
+        """
+        lines = []
+        for line in str(value).expandtabs().split('\n'):
+            lines.extend(textwrap.wrap(line, width) or [''] if len(line) > width else [line])
+        return lines
+
+    def hrule(self, columns: list):
+        """Возвращает горизонтальную линию таблицы
+        Args:
+            columns (list): Номера выводимых столбцов
+        Returns:
+            (str): Линия таблицы
+        """
+        return '+' + '+'.join('-' * (self.widths[i] + 2) for i in columns) + '+'
+
+    def format_row(self, row: list, columns: list):
+        """Преобразует строку таблицы в текст вместе с линией под ней. Высота строки считается по всем столбцам,
+        как в PrettyTable
+        Args:
+            row (list): Значения всех столбцов
+            columns (list): Номера выводимых столбцов
+        Returns:
+            (str): Текст строки таблицы
+        """
+        cells = [self.wrap(value, width) for value, width in zip(row, self.widths)]
+        height = max(len(cell) for cell in cells)
+        lines = ['|' + ''.join(f" {cells[i][y] if y < len(cells[i]) else '':<{self.widths[i]}} |" for i in columns)
+                 for y in range(height)]
+        return '\n'.join(lines + [self.hrule(columns)])
+
+    def write(self, rows, fields: list, file=None):
+        """Печатает таблицу, читая строки по мере вывода
+        Args:
+            rows: Итерируемый объект со строками таблицы
+            fields (list): Названия выводимых столбцов
+            file: Поток вывода или имя файла, по умолчанию sys.stdout. Файл создаётся только после чтения первых
+                строк, поэтому при ошибке в них пустой файл не остаётся
+        """
+        file = sys.stdout if file is None else file
+        rows = iter(rows)
+        sample = list(islice(rows, self.sample_size))
+        self.fit(sample)
+        if isinstance(file, str):
+            os.makedirs(os.path.dirname(file) or '.', exist_ok=True)
+            with open(file, 'w', encoding='utf-8') as stream:
+                self.print_rows(chain(sample, rows), fields, stream)
+        else:
+            self.print_rows(chain(sample, rows), fields, file)
+
+    def print_rows(self, rows, fields: list, file):
+        """Печатает таблицу с уже подобранной шириной столбцов
+        Args:
+            rows: Итерируемый объект со строками таблицы
+            fields (list): Названия выводимых столбцов
+            file: Поток вывода
+        """
+        columns = [i for i, name in enumerate(self.field_names) if name in fields]
+        hrule = self.hrule(columns)
+        header = '|' + ''.join(f" {self.field_names[i]:<{self.widths[i]}} |" for i in columns)
+        print(f"{hrule}\n{header}\n{hrule}", file=file)
+        for row in rows:
+            print(self.format_row(row, columns), file=file)
+
+
 class TableOfDataSet(object):
     """Класс для демонстрации вакансий из базы данных в виде таблицы в консоле
     Attributes:
         name (str): Название файла
-        filter_params (str или list): Параметры фильтрации вакансий
+        filter_params (str или list): Выражение фильтрации вакансий, после проверки - разобранное parse_filter
         sort_params (str): Параметры сортировки вакансий
         is_sort_reverse (bool или str): Атрибут, указывающий на необходимость обратной сортировки
         numbers (list): Список, содержащий границы номеров вакансий, которые нужно выводить
         new_fields (list): Список столбцов, которые нужно выводить
-        my_table (PrettyTable): Объект консольной таблицы
+        my_table (TableWriter): Объект потокового вывода консольной таблицы
         need_filter (bool): Атрибут, указывающий на необходимость фильтрации
         needSort (bool): Атрибут, указывающий на необходимость сортировки
         data_set (DataSet): База данных с вакансиями
+        params (dict): Ответы на вопросы вместо ввода из консоли, None если ответы вводит пользователь
+        file: Поток вывода таблицы
     """
 
-    def __init__(self):
-        self.name: str = input("Введите название файла: ")
-        self.filter_params = input("Введите параметр фильтрации: ")
-        self.sort_params = input("Введите параметр сортировки: ")
-        self.is_sort_reverse = input("Обратный порядок сортировки (Да / Нет): ")
-        self.numbers = input("Введите диапазон вывода: ").split()
-        self.new_fields = [x for x in input("Введите требуемые столбцы: ").split(', ') if x != '']
+    def __init__(self, params=None, data_set=None, file=None):
+        """Инициализирует объект TableOfDataSet, принимает параметры из консоли или из словаря и выводит таблицу
+        Args:
+            params (dict): Ответы на вопросы с ключами file, filter, sort, reverse, range, fields в том виде, в котором
+                их вводит пользователь, по умолчанию None - ответы вводятся из консоли
+            data_set (DataSet): Уже прочитанная база данных с вакансиями, по умолчанию читается файл из ответов
+            file: Поток вывода таблицы или имя файла, по умолчанию sys.stdout
+        """
+        self.params = params
+        self.file = file
+        self.name: str = data_set.file_name if data_set is not None else self.ask("file", "Введите название файла: ")
+        self.filter_params = self.ask("filter", "Введите параметр фильтрации: ")
+        self.sort_params = self.ask("sort", "Введите параметр сортировки: ")
+        self.is_sort_reverse = self.ask("reverse", "Обратный порядок сортировки (Да / Нет): ")
+        self.numbers = self.ask("range", "Введите диапазон вывода: ").split()
+        self.new_fields = [x for x in self.ask("fields", "Введите требуемые столбцы: ").split(', ') if x != '']
         self.new_fields.append('№')
-        self.my_table = PrettyTable(border=True, header=True, hrules=prettytable.ALL)
+        self.my_table = TableWriter(headings, max_width=20)
         self.need_filter = len(self.filter_params) > 0
         self.needSort = len(self.sort_params) > 0
         self.check_inputs()
         self.is_sort_reverse = True if self.is_sort_reverse == "Да" else False
-        self.data_set = DataSet(self.name)
+        self.data_set = DataSet(self.name) if data_set is None else data_set
         if len(self.numbers) < 2:
             self.numbers = [1, self.data_set.vacancies_number + 1] if len(self.numbers) == 0 else [
                 self.numbers[0],
                 self.data_set.vacancies_number + 1]
-        if self.needSort:
-            self.data_set.sort(self.sort_params, self.is_sort_reverse)
         self.table_fill()
 
+    def ask(self, key: str, prompt: str):
+        """Возвращает ответ на вопрос из params, а если их нет - спрашивает пользователя
+        Args:
+            key (str): Ключ ответа в params
+            prompt (str): Вопрос пользователю
+        Returns:
+            (str): Ответ
+        """
+        return input(prompt) if self.params is None else self.params.get(key, "")
+
     def check_inputs(self):
         """ Проверяет данные, введённые пользователем на корректность
         """
         if self.need_filter:
-            if not ':' in self.filter_params:
-                print("Формат ввода некорректен")
-                quit()
-            self.filter_params = self.filter_params.split(': ', 1)
-            if not self.filter_params[0] in functions_for_filter.keys():
-                print("Параметр поиска некорректен")
-                quit()
-        if self.needSort and not self.sort_params in functions_for_sort.keys():
+            self.filter_params = parse_filter(self.filter_params)
+            for condition in chain.from_iterable(self.filter_params):
+                if len(condition) < 2 and not ':' in condition[0]:
+                    print("Формат ввода некорректен")
+                    quit()
+                if not condition[0] in functions_for_filter.keys():
+                    print("Параметр поиска некорректен")
+                    quit()
+        if self.needSort and not all(param in functions_for_sort.keys() for param, _ in parse_sort(self.sort_params)):
             print("Параметр сортировки некорректен")
             quit()
         if not self.is_sort_reverse in ["Да", "Нет", ""]:
@@ -598,13 +2020,11 @@ class TableOfDataSet(object):
     def table_fill(self):
         """Стилизует и заполняет таблицу данными
         """
-        self.my_table.field_names = headings
-        self.my_table.add_rows(self.data_set.get_rows(self.need_filter, self.filter_params))
-        self.my_table.align = "l"
-        self.my_table.max_width = 20
+        rows = self.data_set.iter_rows(self.need_filter, self.filter_params,
+                                       self.sort_params if self.needSort else None, self.is_sort_reverse,
+                                       int(self.numbers[0]) - 1, int(self.numbers[1]) - 1)
         self.new_fields = self.new_fields if len(self.new_fields) > 1 else self.my_table.field_names
-        print(self.my_table.get_string(start=int(self.numbers[0]) - 1, end=int(self.numbers[1]) - 1,
-                                       fields=self.new_fields))
+        self.my_table.write(rows, self.new_fields, self.file)
 
 
 class InputConnect(object):
@@ -625,4 +2045,5 @@ class InputConnect(object):
             x.generate_pdf()
 
 
-InputConnect()
+if __name__ == '__main__':
+    InputConnect()
@@ -0,0 +1,86 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+
+from main import DataSet, Report, TableOfDataSet
+
+report_formats = {"image": Report.generate_image, "excel": Report.generate_excel, "pdf": Report.generate_pdf}
+
+
+def read_jobs(file_name: str):
+    """Читает файл с заданиями, в каждой непустой строке которого записано одно задание в формате json
+    Args:
+        file_name (str): Название файла с заданиями
+    Returns:
+        (generator): Генератор заданий в виде словарей
+    """
+    with open(file_name, encoding='utf-8-sig') as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def run_job(data_set: DataSet, job: dict):
+    """Выполняет одно задание над уже прочитанной базой данных. Если в задании есть job_name, строится отчёт по
+    профессии в форматах из formats (по умолчанию изображение и таблица .xlsx). Если в задании есть filter, sort,
+    reverse, range или fields, выводится таблица вакансий, ответы записываются так же, как их вводит пользователь.
+    Всё сохраняется в папку output, таблица вакансий - в файл table.txt, без output таблица печатается в консоль.
+    Папка и файлы создаются только после проверки параметров задания, на неизвестный формат отчёта бросается ValueError
+    Args:
+        data_set (DataSet): База данных с вакансиями
+        job (dict): Задание
+    """
+    output = job.get("output")
+    if job.get("job_name"):
+        formats = job.get("formats", ["image", "excel"])
+        if not all(x in report_formats for x in formats):
+            raise ValueError("Формат отчёта некорректен")
+        if output:
+            os.makedirs(output, exist_ok=True)
+        report = Report(data_set.file_name, job["job_name"], data_set, output or '.')
+        try:
+            for x in formats:
+                report_formats[x](report)
+        finally:
+            report.close()
+    if any(key in job for key in ["filter", "sort", "reverse", "range", "fields"]):
+        TableOfDataSet(job, data_set, os.path.join(output, "table.txt") if output else None)
+
+
+def main(args=None):
+    """Выполняет все задания из файла над одним файлом с вакансиями, который читается один раз: таблица, индексы
+    и кэш сортировок общие для всех заданий, а статистика по всем профессиям считается заранее за один проход.
+    С параметром --state файл добавляется к накопленной статистике, и отчёты строятся по ней, а таблицы вакансий -
+    только по новому файлу. Задание с ошибкой пропускается, номер задания и ошибка печатаются в stderr
+    Args:
+        args (list): Аргументы командной строки, по умолчанию sys.argv
+    """
+    parser = argparse.ArgumentParser(description="Пакетное построение отчётов и таблиц по файлу с вакансиями")
+    parser.add_argument("file_name", help="Файл с вакансиями (.csv)")
+    parser.add_argument("jobs", help="Файл с заданиями, по одному json объекту в строке")
+    parser.add_argument("--processes", type=int, default=multiprocessing.cpu_count(),
+                        help="Количество процессов для анализа файла")
+    parser.add_argument("--no-cache", action="store_true", help="Не читать и не сохранять кэш таблицы")
+    parser.add_argument("--state", help="Файл накопленной статистики: file_name добавляется к ней, а отчёты по "
+                                        "профессиям строятся по всей статистике")
+    args = parser.parse_args(args)
+    data_set = DataSet(args.file_name, args.processes, not args.no_cache)
+    jobs = list(read_jobs(args.jobs))
+    job_names = list(dict.fromkeys(job["job_name"] for job in jobs if job.get("job_name")))
+    if args.state:
+        data_set.update_analyze_state(args.state, job_names)
+    elif len(job_names) > 1:
+        data_set.fill_analyze_set(job_names)
+    for number, job in enumerate(jobs, 1):
+        try:
+            run_job(data_set, job)
+        except SystemExit:
+            print(f"Задание {number} не выполнено", file=sys.stderr)
+        except Exception as error:
+            print(f"Задание {number} не выполнено: {error!r}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,14 +1,19 @@
 import csv
+import functools
 import multiprocessing
 import concurrent.futures as pool
 import re
 import matplotlib.pyplot as plt
 import numpy as np
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from openpyxl import Workbook
 from openpyxl.styles import Font, Border, Side
 from jinja2 import Environment, FileSystemLoader
 import pdfkit
+import prettytable
+from prettytable import PrettyTable
+from shared_vacancies import SharedVacancyTable, VacancyView, count_vacancies, file_to_rows, year_columns
+import json
 import os
 
 
@@ -23,6 +28,37 @@ def exp_for_num(s: str):
     return 0 if len(s) == 0 else int(s[0])
 
 
+@functools.lru_cache(maxsize=1 << 16)
+def parse_published_at(s: str):
+    """Быстро преобразует дату публикации формата 2022-07-05T18:19:30+0300 в datetime срезами строки, результат
+    запоминается, так как у многих вакансий дата совпадает. Строки другого формата разбираются через strptime
+    Args:
+        s (str): Дата публикации вакансии
+    Returns:
+        datetime: Дата с часовым поясом, такая же, как у datetime.strptime(s, '%Y-%m-%dT%H:%M:%S%z')
+    """
+    if len(s) != 24 or s[4] != '-' or s[7] != '-' or s[10] != 'T' or s[13] != ':' or s[16] != ':' or \
+            s[19] not in '+-':
+        return datetime.strptime(s, '%Y-%m-%dT%H:%M:%S%z')
+    digits = s[:4] + s[5:7] + s[8:10] + s[11:13] + s[14:16] + s[17:19] + s[20:]
+    if not (digits.isascii() and digits.isdigit()):
+        return datetime.strptime(s, '%Y-%m-%dT%H:%M:%S%z')
+    return datetime(int(s[:4]), int(s[5:7]), int(s[8:10]), int(s[11:13]), int(s[14:16]), int(s[17:19]),
+                    tzinfo=time_zone(s[19:]))
+
+
+@functools.lru_cache(maxsize=None)
+def time_zone(s: str):
+    """Возвращает часовой пояс по смещению формата +0300, один объект на каждое смещение
+    Args:
+        s (str): Смещение относительно UTC
+    Returns:
+        timezone: Часовой пояс
+    """
+    offset = timedelta(hours=int(s[1:3]), minutes=int(s[3:5]))
+    return timezone(-offset if s[0] == '-' else offset)
+
+
 headings = ['№', 'Название', 'Описание', 'Навыки', 'Опыт работы', 'Премиум-вакансия', 'Компания',
             'Оклад', 'Название региона', 'Дата публикации вакансии']
 currency = {"AZN": "Манаты",
@@ -140,7 +176,7 @@ class Vacancy(object):
         self.area_name = vacancy['area_name']
         self.year = self.make_date_from_str(vacancy['published_at'])
         if len(vacancy) > 6:
-            self.published_at = datetime.strptime(vacancy['published_at'], '%Y-%m-%dT%H:%M:%S%z')
+            self.published_at = parse_published_at(vacancy['published_at'])
             self.description = vacancy['description']
             self.key_skills = vacancy['key_skills'].split(';;')
             self.experience_id = experience[vacancy['experience_id']]
@@ -176,16 +212,97 @@ class Vacancy(object):
                 self.published_at.strftime("%d.%m.%Y")]
 
 
+def year_analyze(file_path: str, job_name: str, years=None, area_name=None):
+    """Анализирует вакансии с файла одного года, функция выполняется в отдельном процессе и возвращает только
+    небольшие суммы, которые складываются с суммами по другим файлам. Названия вакансий часто повторяются,
+    поэтому поиск профессии в названии выполняется один раз для каждого различного названия
+
+    Args:
+        file_path (str): Название файла и путь к нему
+        job_name (str): Название профессии
+        years (tuple): Первый и последний учитываемый год, по умолчанию все годы
+        area_name (str): Учитываемый регион, по умолчанию все регионы
+
+    Returns:
+        (dict): Словарь со словарями количества вакансий и сумм зарплат по годам и по регионам
+    """
+    if file_path.endswith('.npz'):
+        return columnar_year_analyze(file_path, job_name, years, area_name)
+    partial = {"number_by_years": {}, "salary_by_years": {}, "number_by_years_job": {}, "salary_by_years_job": {},
+               "number_by_area": {}, "salary_by_area": {}}
+    is_job = {}
+    for vac in (Vacancy(x) for x in DataSet.file_to_rows(file_path)):
+        if years and not years[0] <= vac.year <= years[1] or area_name and vac.area_name != area_name:
+            continue
+        salary = vac.salary.mid_salary_in_rubles
+        partial["number_by_years"][vac.year] = partial["number_by_years"].get(vac.year, 0) + 1
+        partial["salary_by_years"][vac.year] = partial["salary_by_years"].get(vac.year, 0) + salary
+        partial["number_by_area"][vac.area_name] = partial["number_by_area"].get(vac.area_name, 0) + 1
+        partial["salary_by_area"][vac.area_name] = partial["salary_by_area"].get(vac.area_name, 0) + salary
+        if vac.name not in is_job:
+            is_job[vac.name] = vac.name.find(job_name) >= 0
+        if is_job[vac.name]:
+            partial["number_by_years_job"][vac.year] = partial["number_by_years_job"].get(vac.year, 0) + 1
+            partial["salary_by_years_job"][vac.year] = partial["salary_by_years_job"].get(vac.year, 0) + salary
+    return partial
+
+
+def columnar_year_analyze(file_path: str, job_name: str, years=None, area_name=None):
+    """Анализирует вакансии с npz файла одного года, записанного Separator.write_columnar. Читаются только нужные
+    столбцы, средняя зарплата в рублях уже посчитана, а суммы по годам и регионам считаются через np.bincount по
+    кодам, поэтому разбор строк и создание объектов Vacancy не нужны
+
+    Args:
+        file_path (str): Название файла и путь к нему
+        job_name (str): Название профессии
+        years (tuple): Первый и последний учитываемый год, по умолчанию все годы
+        area_name (str): Учитываемый регион, по умолчанию все регионы
+
+    Returns:
+        (dict): Словарь со словарями количества вакансий и сумм зарплат по годам и по регионам
+    """
+    with np.load(file_path) as data:
+        year, salary, name, area = data['year'], data['salary'], data['name'], data['area']
+        names, areas = data['names'], data['areas']
+    if years or area_name:
+        keep = np.ones(len(year), dtype=bool)
+        if years:
+            keep &= (year >= years[0]) & (year <= years[1])
+        if area_name:
+            keep &= area == (areas.tolist().index(area_name) if area_name in areas else -1)
+        year, salary, name, area = year[keep], salary[keep], name[keep], area[keep]
+    years, year_codes = np.unique(year, return_inverse=True)
+    is_job = (np.char.find(names, job_name) >= 0)[name] if len(names) else np.zeros(0, dtype=bool)
+    number_by_years = np.bincount(year_codes, minlength=len(years))
+    salary_by_years = np.bincount(year_codes, weights=salary, minlength=len(years))
+    number_by_years_job = np.bincount(year_codes[is_job], minlength=len(years))
+    salary_by_years_job = np.bincount(year_codes[is_job], weights=salary[is_job], minlength=len(years))
+    number_by_area = np.bincount(area, minlength=len(areas))
+    salary_by_area = np.bincount(area, weights=salary, minlength=len(areas))
+    years = years.tolist()
+    areas = areas.tolist()
+    return {"number_by_years": dict(zip(years, number_by_years.tolist())),
+            "salary_by_years": dict(zip(years, salary_by_years.tolist())),
+            "number_by_years_job": {y: n for y, n in zip(years, number_by_years_job.tolist()) if n},
+            "salary_by_years_job": {y: s for y, s, n in zip(years, salary_by_years_job.tolist(),
+                                                           number_by_years_job.tolist()) if n},
+            "number_by_area": {a: n for a, n in zip(areas, number_by_area.tolist()) if n},
+            "salary_by_area": {a: s for a, s, n in zip(areas, salary_by_area.tolist(), number_by_area.tolist()) if n}}
+
+
 class DataSet(object):
     """Класс, который преобразует csv файл в базу данных информации о вакансиях, и анализирует эту информацию
     Attributes:
         path_name (str): Директория файла
         vacancies_objects (list): Список, хранящий вакансии в виде объекта Vacancy
+        vacancies_table (SharedVacancyTable): Столбцы вакансий в общей памяти, None, если вакансии не загружены
         vacancies_number (int): Количество вакансий
         salary_by_years (dict): Словарь с зарплатами по годам
         number_by_years (dict): Словарь с количеством вакансий по годам
         salary_by_years_job (dict): Словарь с зарплатами по годам, по выбранной профессии
         number_by_years_job (dict): Словарь с количеством вакансий по годам, по выбранной профессии
+        salary_by_area (dict): Словарь с зарплатами по регионам
+        share_number_by_area (dict): Словарь с количеством зарплат по регионам
     """
 
     def __init__(self, path_name: str):
@@ -195,60 +312,249 @@ class DataSet(object):
         """
         self.path_name = path_name
         self.vacancies_objects = []
+        self.vacancies_table = None
         self.vacancies_number = 0
         self.job_name = ''
         self.salary_by_years = dict()
         self.number_by_years = dict()
         self.salary_by_years_job = dict()
         self.number_by_years_job = dict()
-
-    def analyze(self, job_name: str):
-        """Анализирует данные и добавляет их в DataSet с применением многопроцессорной обработки
+        self.salary_by_area = dict()
+        self.share_number_by_area = dict()
+
+    def analyze(self, job_name: str, years=None, area_name=None):
+        """Анализирует данные и добавляет их в DataSet с применением многопроцессорной обработки. Файлы раздаются
+        процессам по одному, начиная с самых больших, чтобы один большой год не задерживал остальные, а результаты
+        складываются в порядке имён файлов, чтобы суммы зарплат не зависели от того, какой процесс закончил первым.
+        Файлы, которые по манифесту не содержат нужных годов или региона, не открываются
         Args:
             job_name (str): Название профессии
+            years (tuple): Первый и последний учитываемый год, по умолчанию все годы
+            area_name (str): Учитываемый регион, по умолчанию все регионы
         """
         self.job_name = job_name
+        files = sorted(self.partition_files(years, area_name), key=os.path.getsize, reverse=True)
         with pool.ProcessPoolExecutor(multiprocessing.cpu_count()) as executor:
-            wait_complete = []
-            for path in os.listdir(self.path_name):
-                future = executor.submit(self.year_analyze, f"{self.path_name}/{path}")
-                wait_complete.append(future)
-
-        for result in pool.as_completed(wait_complete):
-            item = result.result()
-            self.salary_by_years[item[0]] = item[1]
-            self.number_by_years[item[0]] = item[0]
-            self.salary_by_years_job[item[0]] = item[3]
-            self.number_by_years_job[item[0]] = item[2]
+            wait_complete = {file_path: executor.submit(year_analyze, file_path, job_name, years, area_name)
+                             for file_path in files}
+            for file_path in sorted(wait_complete):
+                self.merge_year_analyze(wait_complete[file_path].result())
+        self.edit_analyze_set()
+        self.print_analyze()
 
+    def load_vacancies(self):
+        """Загружает все вакансии папки в общую память с применением многопроцессорной обработки. Количество строк
+        каждого файла берётся из манифеста (или считается отдельным проходом, если манифеста нет), родительский
+        процесс заранее создаёт столбцы нужной длины и блок для байтов строк размером с файлы, и каждый процесс
+        пишет свой файл в свою часть столбцов, поэтому склеивать и копировать части не нужно. При ошибке общая
+        память освобождается. Вакансии доступны в vacancies_objects в виде объектов Vacancy
+        """
+        files = sorted(self.partition_files())
+        if any(file.endswith('.npz') for file in files):
+            print("Для загрузки вакансий нужны csv файлы по годам")
+            quit()
+        headers = set()
+        for file in files:
+            with open(file, encoding='utf-8-sig') as r_file:
+                headers.add(tuple(next(csv.reader(r_file), [])))
+        if len(headers) > 1:
+            print("Столбцы файлов по годам различаются")
+            quit()
+        header = headers.pop() if headers else ()
+        is_full = bool(header) and all(column in header for column in SharedVacancyTable.full_columns)
+        manifest = self.read_manifest()
+        if all(os.path.basename(file) in manifest for file in files):
+            lengths = [manifest[os.path.basename(file)]["rows"] for file in files]
+        else:
+            with pool.ProcessPoolExecutor(multiprocessing.cpu_count()) as executor:
+                lengths = list(executor.map(count_vacancies, files))
+        starts = np.concatenate(([0], np.cumsum(lengths, dtype=np.int64))).tolist()
+        text_starts = np.concatenate(([0], np.cumsum([os.path.getsize(file) for file in files],
+                                                     dtype=np.int64))).tolist()
+        self.close()
+        table = SharedVacancyTable(starts[-1], text_starts[-1], is_full)
+        try:
+            names = table.block_names()
+            tasks = [(file, names, is_full, starts[i], starts[i + 1] - starts[i], text_starts[i],
+                      text_starts[i + 1] - text_starts[i]) for i, file in enumerate(files)]
+            with pool.ProcessPoolExecutor(multiprocessing.cpu_count()) as executor:
+                results = [future.result() for future in [executor.submit(year_columns, *task) for task in tasks]]
+            for file_start, file_end, dictionaries in zip(starts, starts[1:], results):
+                table.merge_dictionaries(file_start, file_end, dictionaries)
+        except BaseException:
+            table.close()
+            raise
+        self.vacancies_table = table
+        self.vacancies_objects = VacancyView(table, Vacancy)
+        self.vacancies_number = starts[-1]
+
+    def close(self):
+        """Освобождает общую память, занятую вакансиями, загруженными методом load_vacancies
+        """
+        if self.vacancies_table is not None:
+            self.vacancies_table.close()
+            self.vacancies_table = None
+            self.vacancies_objects = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def read_manifest(self):
+        """Читает manifest.json папки с файлами по годам, оставляя только сводки файлов, которые не менялись после
+        записи манифеста
+
+        Returns:
+            (dict): Сводки по именам файлов, пустой словарь, если манифеста нет
+        """
+        manifest_name = os.path.join(self.path_name, 'manifest.json')
+        if not os.path.exists(manifest_name):
+            return {}
+        with open(manifest_name, encoding='utf-8') as file:
+            manifest = json.load(file)
+        if manifest.get("version") != 1:
+            return {}
+        partitions = {}
+        for name, stats in manifest["partitions"].items():
+            path = os.path.join(self.path_name, name)
+            if os.path.exists(path) and (os.stat(path).st_size, os.stat(path).st_mtime_ns) == \
+                    (stats["size"], stats["mtime_ns"]):
+                partitions[name] = stats
+        return partitions
+
+    @staticmethod
+    def partition_matches(stats: dict, years=None, area_name=None):
+        """Проверяет по сводке из манифеста, могут ли в файле быть вакансии нужных годов и региона
+
+        Args:
+            stats (dict): Сводка по файлу
+            years (tuple): Первый и последний учитываемый год
+            area_name (str): Учитываемый регион
+
+        Returns:
+            (bool): False, если файл можно не открывать
+        """
+        if stats["rows"] == 0:
+            return False
+        if years and (int(stats["max_published_at"][:4]) < years[0] or int(stats["min_published_at"][:4]) > years[1]):
+            return False
+        return not area_name or area_name in stats["areas"]
+
+    def partition_files(self, years=None, area_name=None):
+        """Возвращает пути к файлам по годам, отбрасывая файлы, которые по манифесту не нужны для анализа
+
+        Args:
+            years (tuple): Первый и последний учитываемый год
+            area_name (str): Учитываемый регион
+
+        Returns:
+            (list): Пути к файлам
+        """
+        manifest = self.read_manifest()
+        return [f"{self.path_name}/{file}" for file in os.listdir(self.path_name)
+                if file.endswith(('.csv', '.npz')) and
+                (file not in manifest or self.partition_matches(manifest[file], years, area_name))]
+
+    @staticmethod
+    def manifest_year_analyze(stats: dict, years=None, area_name=None):
+        """Собирает из сводки файла в манифесте такой же словарь, как у year_analyze, но без сумм по профессии
+
+        Args:
+            stats (dict): Сводка по файлу
+            years (tuple): Первый и последний учитываемый год
+            area_name (str): Учитываемый регион
+
+        Returns:
+            (dict): Словарь со словарями количества вакансий и сумм зарплат по годам и по регионам
+        """
+        partial = {"number_by_years": {}, "salary_by_years": {}, "number_by_years_job": {}, "salary_by_years_job": {},
+                   "number_by_area": {}, "salary_by_area": {}}
+        if not DataSet.partition_matches(stats, years, area_name):
+            return partial
+        if not area_name and (not years or years[0] <= int(stats["min_published_at"][:4]) and
+                              int(stats["max_published_at"][:4]) <= years[1]):
+            for year, (number, salary) in stats["years"].items():
+                partial["number_by_years"][int(year)], partial["salary_by_years"][int(year)] = number, salary
+            for area, (number, salary) in stats["by_area"].items():
+                partial["number_by_area"][area], partial["salary_by_area"][area] = number, salary
+            return partial
+        for year, area, number, salary in stats["groups"]:
+            if years and not years[0] <= year <= years[1] or area_name and area != area_name:
+                continue
+            partial["number_by_years"][year] = partial["number_by_years"].get(year, 0) + number
+            partial["salary_by_years"][year] = partial["salary_by_years"].get(year, 0) + salary
+            partial["number_by_area"][area] = partial["number_by_area"].get(area, 0) + number
+            partial["salary_by_area"][area] = partial["salary_by_area"].get(area, 0) + salary
+        return partial
+
+    def analyze_manifest(self, years=None, area_name=None):
+        """Считает статистику по годам и регионам только по manifest.json, не открывая файлы с вакансиями.
+        Статистика по профессии в манифесте не хранится и остаётся пустой
+
+        Args:
+            years (tuple): Первый и последний учитываемый год, по умолчанию все годы
+            area_name (str): Учитываемый регион, по умолчанию все регионы
+
+        Returns:
+            (bool): False, если манифеста нет или он описывает не все файлы папки
+        """
+        manifest = self.read_manifest()
+        files = [file for file in os.listdir(self.path_name) if file.endswith(('.csv', '.npz'))]
+        if not files or any(file not in manifest for file in files):
+            return False
+        for file in sorted(files):
+            self.merge_year_analyze(self.manifest_year_analyze(manifest[file], years, area_name))
+        self.edit_analyze_set()
         self.print_analyze()
+        return True
 
-    def year_analyze(self, file_path):
-        """Анализирует и сохраняет вакансии с файла одного года
+    def merge_year_analyze(self, partial: dict):
+        """Добавляет суммы, посчитанные процессом по одному файлу, к общим суммам
 
         Args:
-            file_path: Название файла и путь к нему
+            partial (dict): Результат функции year_analyze
+        """
+        for year, number in partial["number_by_years"].items():
+            self.number_by_years[year] = self.number_by_years.get(year, 0) + number
+            self.salary_by_years[year] = self.salary_by_years.get(year, 0) + partial["salary_by_years"][year]
+            self.number_by_years_job[year] = self.number_by_years_job.get(year, 0) + \
+                partial["number_by_years_job"].get(year, 0)
+            self.salary_by_years_job[year] = self.salary_by_years_job.get(year, 0) + \
+                partial["salary_by_years_job"].get(year, 0)
+        for area, number in partial["number_by_area"].items():
+            self.share_number_by_area[area] = self.share_number_by_area.get(area, 0) + number
+            self.salary_by_area[area] = self.salary_by_area.get(area, 0) + partial["salary_by_area"][area]
+        self.vacancies_number += sum(partial["number_by_years"].values())
+
+    def edit_analyze_set(self):
+        """Редактирует словари для анализа данных, изменяя суммы под конечные данные, готовые к работе
         """
-        vacancies_objects = [Vacancy(x) for x in self.file_to_rows(file_path)]
-        number_by_years = 0
-        salary_by_years = 0
-        number_by_years_job = 0
-        salary_by_years_job = 0
-        year = vacancies_objects[0].year
-        for vac in vacancies_objects:
-            number_by_years = number_by_years + 1
-            salary_by_years = salary_by_years + vac.salary.mid_salary_in_rubles
-
-            if vac.name.find(self.job_name) >= 0:
-                number_by_years_job = number_by_years_job + 1
-                salary_by_years_job = salary_by_years_job + vac.salary.mid_salary_in_rubles
-
-        salary_by_years = int(salary_by_years / number_by_years) if \
-            number_by_years != 0 else 0
-        salary_by_years_job = int(salary_by_years_job / number_by_years_job) if \
-            number_by_years_job != 0 else 0
-        self.vacancies_objects += vacancies_objects
-        return year, number_by_years, salary_by_years, number_by_years_job, salary_by_years_job
+        for key in self.salary_by_years.keys():
+            self.salary_by_years[key] = int(self.salary_by_years[key] / self.number_by_years[key]) if \
+                self.number_by_years[key] != 0 else 0
+        for key in self.salary_by_years_job.keys():
+            self.salary_by_years_job[key] = int(self.salary_by_years_job[key] / self.number_by_years_job[key]) if \
+                self.number_by_years_job[key] != 0 else 0
+        self.salary_by_years = dict(sorted(self.salary_by_years.items()))
+        self.number_by_years = dict(sorted(self.number_by_years.items()))
+        self.salary_by_years_job = dict(sorted(self.salary_by_years_job.items()))
+        self.number_by_years_job = dict(sorted(self.number_by_years_job.items()))
+
+        areas = []
+        for key in self.salary_by_area.keys():
+            self.salary_by_area[key] = int(self.salary_by_area[key] / self.share_number_by_area[key])
+            self.share_number_by_area[key] = round(self.share_number_by_area[key] / self.vacancies_number, 4)
+            if self.share_number_by_area[key] < 0.01:
+                areas.append(key)
+        for key in areas:
+            del self.salary_by_area[key]
+            del self.share_number_by_area[key]
+
+        self.salary_by_area = dict(sorted(self.salary_by_area.items(), key=lambda x: x[1], reverse=True)[:10])
+        self.share_number_by_area = dict(
+            sorted(self.share_number_by_area.items(), key=lambda x: x[1], reverse=True)[:10])
 
     def print_analyze(self):
         """Печатает в консоль данные с проведённого анализа вакансий
@@ -257,6 +563,8 @@ class DataSet(object):
         print(f"Динамика количества вакансий по годам: {self.number_by_years}")
         print(f"Динамика уровня зарплат по годам для выбранной профессии: {self.salary_by_years_job}")
         print(f"Динамика количества вакансий по годам для выбранной профессии: {self.number_by_years_job}")
+        print(f"Уровень зарплат по городам (в порядке убывания): {self.salary_by_area}")
+        print(f"Доля вакансий по городам (в порядке убывания): {self.share_number_by_area}")
 
     @staticmethod
     def file_to_rows(file_path):
@@ -266,15 +574,7 @@ class DataSet(object):
         Args:
             file_path: Название файла и путь к нему
         """
-        r_file = open(file_path, encoding='utf-8-sig')
-        file = csv.reader(r_file)
-        text = [x for x in file]
-        if len(text) < 2:
-            print("Пустой файл" if len(text) < 1 else "Нет данных")
-            quit()
-        vacancy = text[0]
-        r_file.close()
-        return [dict(zip(vacancy, x)) for x in text[1:] if len([value for value in x if value]) == len(vacancy)]
+        return file_to_rows(file_path)
 
     def sort(self, sort_params: str, is_sort_reverse=False):
         """Сортирует список вакансий по нужным требованиям
@@ -457,7 +757,11 @@ class InputConnect(object):
     def __init__(self):
         """Иницилизирует объект класса InputConnect, принимает данные из консоли и передаёт их в необходимые классы
         """
+        report_type = input("Введите тип данных для вывода(Статистика/Вакансии): ")
         name = input("Введите название директории: ")
+        if report_type == "Вакансии":
+            self.print_vacancies(name)
+            return
         job_name = input("Введите название профессии: ")
         start_time = datetime.now()
         x = Report(name, job_name)
@@ -465,6 +769,39 @@ class InputConnect(object):
         x.generate_pdf()
         print(datetime.now() - start_time)
 
+    @staticmethod
+    def print_vacancies(name: str):
+        """Загружает вакансии всех файлов папки в общую память и печатает их таблицей
+        Args:
+            name (str): Название директории с файлами по годам
+        """
+        filter_params = input("Введите параметр фильтрации: ")
+        sort_params = input("Введите параметр сортировки: ")
+        is_sort_reverse = input("Обратный порядок сортировки (Да / Нет): ")
+        if filter_params and (': ' not in filter_params or filter_params.split(': ')[0] not in functions_for_filter):
+            print("Параметр поиска некорректен")
+            quit()
+        if sort_params and sort_params not in functions_for_sort:
+            print("Параметр сортировки некорректен")
+            quit()
+        if is_sort_reverse not in ["Да", "Нет", ""]:
+            print("Порядок сортировки задан некорректно")
+            quit()
+        with DataSet(name) as data_set:
+            data_set.load_vacancies()
+            if not data_set.vacancies_table.is_full:
+                print("В файлах нет полной информации о вакансиях")
+                quit()
+            if sort_params:
+                data_set.sort(sort_params, is_sort_reverse == "Да")
+            rows = data_set.get_rows(bool(filter_params), filter_params.split(': ', 1))
+            my_table = PrettyTable(border=True, header=True, hrules=prettytable.ALL)
+            my_table.field_names = headings
+            my_table.add_rows(rows)
+            my_table.align = "l"
+            my_table.max_width = 20
+            print(my_table)
+
 
 if __name__ == '__main__':
     InputConnect()
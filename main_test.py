@@ -1,5 +1,32 @@
+import contextlib
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from types import GeneratorType
 from unittest import TestCase
-from main import DataSet, Salary, functions_for_filter
+
+import numpy as np
+import prettytable
+
+from main import AhoCorasick, AnalyzeSet, DataSet, Salary, TableOfDataSet, TableWriter, Vacancy, VacancyIndex, \
+    VacancyTable, analyze_file_range, functions_for_filter, functions_for_sort, headings, parse_filter, \
+    parse_published_at, split_file, stable_argsort, top_k_argsort
+from csv_file_separator import Separator
+from main_batch import main as main_batch, run_job
+from main_concurrent_futures import DataSet as FuturesDataSet
+from main_multiprocessing import DataSet as PartitionedDataSet, Vacancy as PartitionedVacancy, year_analyze
+
+
+def write_temp_csv(text: str):
+    """Записывает csv во временный файл и возвращает путь к нему"""
+    file = tempfile.NamedTemporaryFile('w', suffix='.csv', encoding='utf-8', delete=False)
+    file.write(text)
+    file.close()
+    return file.name
 
 
 class DataSetTests(TestCase):
@@ -9,6 +36,56 @@ class DataSetTests(TestCase):
         self.assertEqual(type(dataset.vacancies_objects[0]).__name__, "Vacancy")
         self.assertEqual(dataset.vacancies_number, len(dataset.vacancies_objects))
 
+    def test_dataset_file_to_rows_streaming(self):
+        dataset = DataSet("vacancies_medium.csv")
+        rows = dataset.file_to_rows()
+        self.assertIsInstance(rows, GeneratorType)
+        self.assertEqual(type(next(rows)).__name__, "dict")
+        rows.close()
+
+    def test_dataset_empty_file(self):
+        for text in ["", "name,salary_from,salary_to,salary_currency,area_name,published_at\n"]:
+            path = write_temp_csv(text)
+            with self.assertRaises(SystemExit):
+                list(DataSet(path).file_to_rows())
+            os.remove(path)
+
+    def test_dataset_change_string(self):
+        self.assertEqual(DataSet.change_string("<p><b>Python</b>  разработчик</p>\nSQL"), "Python разработчик;;SQL")
+        self.assertEqual(DataSet.change_string(" Москва  "), "Москва")
+        self.assertEqual(DataSet.change_string("a < b"), "a < b")
+        row = next(DataSet.reader_to_rows(["name", "salary_from", "experience_id", "premium", "published_at"],
+                                          [["<b>Аналитик</b>", " 100", " noExperience", "True ",
+                                            "2022-07-05T18:19:30+0300"]]))
+        self.assertEqual(row, {"name": "Аналитик", "salary_from": "100", "experience_id": "noExperience",
+                               "premium": "True", "published_at": "2022-07-05T18:19:30+0300"})
+
+    def test_dataset_table_columns(self):
+        table = DataSet("vacancies_medium.csv").table
+        self.assertEqual(table.salary_from.dtype.name, "float64")
+        self.assertEqual(table.mid_salary_in_rubles.dtype.name, "float64")
+        self.assertEqual(table.year.dtype.name, "int16")
+        self.assertEqual(table.area_name.dtype.name, "int32")
+        self.assertEqual(table.employer_name.dtype.name, "int32")
+        vacancy = Vacancy(next(DataSet("vacancies_medium.csv").file_to_rows()))
+        self.assertEqual(DataSet("vacancies_medium.csv").vacancies_objects[0].get_row(0), vacancy.get_row(0))
+
+    def test_dataset_cache(self):
+        with open("vacancies_medium.csv", encoding='utf-8-sig') as file:
+            path = write_temp_csv(file.read())
+        table = DataSet(path, use_cache=True).table
+        cached = DataSet(path, use_cache=True).load_cache()
+        self.assertEqual(len(cached), len(table))
+        self.assertEqual(list(cached.name), list(table.name))
+        self.assertEqual(cached.dictionaries, table.dictionaries)
+        self.assertEqual(DataSet(path, use_cache=True).vacancies_objects[0].get_row(0),
+                         DataSet(path).vacancies_objects[0].get_row(0))
+        with open(path, 'a', encoding='utf-8') as file:
+            file.write("\n")
+        self.assertIsNone(DataSet(path, use_cache=True).load_cache())
+        shutil.rmtree(f"{path}.cache")
+        os.remove(path)
+
     def test_dataset_analyze(self):
         dataset = DataSet("vacancies_medium.csv")
         dataset.analyze("Аналитик")
@@ -16,6 +93,149 @@ class DataSetTests(TestCase):
         self.assertNotEqual(dataset.salary_by_years[2022], dataset.salary_by_years_job[2022])
         self.assertEqual(dataset.salary_by_area["Екатеринбург"], 95270)
 
+    def test_analyze_set_merge(self):
+        rows = list(DataSet("vacancies_medium.csv").file_to_rows())
+        whole = AnalyzeSet.from_table(VacancyTable.from_rows(rows), "Аналитик")
+        merged = AnalyzeSet.from_table(VacancyTable.from_rows(rows[:100]), "Аналитик")
+        merged.merge(AnalyzeSet.from_table(VacancyTable.from_rows(rows[100:]), "Аналитик"))
+        self.assertEqual(merged.vacancies_number, whole.vacancies_number)
+        self.assertEqual(merged.to_dicts()[1], whole.to_dicts()[1])
+        self.assertEqual(merged.to_dicts()[3], whole.to_dicts()[3])
+        self.assertEqual(merged.to_dicts()[5], whole.to_dicts()[5])
+
+    def test_aho_corasick(self):
+        patterns = ["he", "she", "his", "hers", "", "аналитик", "he"]
+        automaton = AhoCorasick(patterns)
+        for text in ["ushers", "this", "Бизнес-аналитик", "", "hehe", "xyz"]:
+            self.assertEqual(automaton.search(text), {i for i, x in enumerate(patterns) if text.find(x) >= 0})
+
+    def test_analyze_set_match_jobs(self):
+        table = DataSet("vacancies_big.csv").table
+        names = np.array(table.dictionaries["name"], object)[table.name]
+        for job_names in [["Программист"], ["Программист", "Аналитик", "", "Нет такой профессии"]]:
+            jobs, rows = AnalyzeSet.match_jobs(table.dictionaries["name"], table.name, job_names)
+            self.assertEqual(sorted(zip(jobs.tolist(), rows.tolist())),
+                             [(job, row) for job, job_name in enumerate(job_names)
+                              for row, name in enumerate(names) if name.find(job_name) >= 0])
+
+    def test_analyze_set_jobs(self):
+        table = DataSet("vacancies_big.csv").table
+        job_names = ["Аналитик", "Программист", "Специалист", "Нет такой профессии"]
+        analyze_set = AnalyzeSet.from_table(table, job_names)
+        salary_by_years_jobs, number_by_years_jobs = analyze_set.jobs_to_dicts()
+        for job_name in job_names:
+            single = AnalyzeSet.from_table(table, job_name).to_dicts()
+            self.assertEqual(salary_by_years_jobs[job_name], single[2])
+            self.assertEqual(number_by_years_jobs[job_name], single[3])
+            self.assertEqual(analyze_set.to_dicts(job_name), single)
+        merged = AnalyzeSet(job_names)
+        merged.merge(analyze_set)
+        merged.merge(analyze_set)
+        self.assertEqual(merged.jobs_to_dicts()[0], salary_by_years_jobs)
+        with self.assertRaises(ValueError):
+            merged.merge(AnalyzeSet(job_names[::-1]))
+
+    def test_analyze_state(self):
+        with open("vacancies_big.csv", encoding='utf-8-sig') as file:
+            header, *rows = list(csv.reader(file))
+        paths = []
+        for part in [rows[:len(rows) // 3], rows[len(rows) // 3:]]:
+            with open(write_temp_csv(""), 'w', encoding='utf-8', newline='') as file:
+                csv.writer(file).writerows([header] + part)
+                paths.append(file.name)
+        state_name = f"{paths[0]}.json"
+        for path in paths + paths[:1]:
+            dataset = DataSet(path)
+            if path == paths[1]:
+                dataset.fill_analyze_set(["Программист", "Специалист", "Аналитик"])
+            dataset.update_analyze_state(state_name, ["Аналитик", "Программист"])
+        dataset = DataSet(paths[0])
+        dataset.load_analyze_state(state_name)
+        dataset.analyze("Программист")
+        whole = AnalyzeSet.from_table(DataSet("vacancies_big.csv").table, "Программист").to_dicts()
+        self.assertEqual((dataset.salary_by_years, dataset.number_by_years, dataset.salary_by_years_job,
+                          dataset.number_by_years_job, dataset.salary_by_area, dataset.share_number_by_area), whole)
+        self.assertEqual(len(AnalyzeSet.load(state_name).files), 2)
+        self.assertEqual(AnalyzeSet.load(state_name).to_dicts("Аналитик"),
+                         AnalyzeSet.from_table(DataSet("vacancies_big.csv").table, "Аналитик").to_dicts())
+        for path in paths + [state_name]:
+            os.remove(path)
+
+    def test_split_file(self):
+        whole = AnalyzeSet.from_table(DataSet("vacancies_big.csv").table, "Аналитик")
+        with open("vacancies_big.csv", encoding='utf-8-sig') as file:
+            header = next(csv.reader(file))
+        for parts in [1, 3, 16]:
+            ranges = split_file("vacancies_big.csv", parts)
+            self.assertEqual(len(ranges), parts)
+            merged = AnalyzeSet("Аналитик")
+            for start, end in ranges:
+                merged.merge(analyze_file_range("vacancies_big.csv", header, start, end, "Аналитик"))
+            self.assertEqual(merged.vacancies_number, whole.vacancies_number)
+            self.assertEqual(merged.to_dicts()[3], whole.to_dicts()[3])
+            self.assertEqual(merged.to_dicts()[5], whole.to_dicts()[5])
+
+    def test_dataset_index(self):
+        dataset = DataSet("vacancies_big.csv")
+        index = VacancyIndex(dataset.table)
+        vacancies = list(dataset.vacancies_objects)
+        checks = [("area_name", "Москва", lambda v: v.area_name == "Москва"),
+                  ("salary_currency", "Доллары", lambda v: v.salary.salary_currency == "Доллары"),
+                  ("premium", "Да", lambda v: v.premium == "Да"),
+                  ("published_at", "06.07.2022", lambda v: v.published_at.strftime("%d.%m.%Y") == "06.07.2022"),
+                  ("name", vacancies[7].name, lambda v: v.name == vacancies[7].name),
+                  ("name", "Нет такой вакансии", lambda v: False)]
+        for field, value, check in checks:
+            expected = [i for i, vacancy in enumerate(vacancies) if check(vacancy)]
+            self.assertEqual(index.lookup(field, value).tolist(), expected)
+        skills = vacancies[3].key_skills[:2]
+        expected = [i for i, vacancy in enumerate(vacancies) if all(x in vacancy.key_skills for x in skills)]
+        self.assertEqual(index.lookup_all("key_skills", skills).tolist(), expected)
+
+    def test_salary_index(self):
+        table = DataSet("vacancies_big.csv").table
+        index = VacancyIndex(table)
+        values = [0, 10000, 50000, 77777.5, 150000, 1e9]
+        values += table.salary_from[:20].tolist() + table.salary_to[:20].tolist()
+        for value in values:
+            expected = np.flatnonzero((table.salary_from <= value) & (value <= table.salary_to))
+            self.assertEqual(index.salaries.stab(value).tolist(), expected.tolist())
+        self.assertEqual(index.count_salaries(values).tolist(),
+                         [len(index.salaries.stab(value)) for value in values])
+
+    def test_salary_range_lookup(self):
+        table = DataSet("vacancies_big.csv").table
+        index = VacancyIndex(table)
+        expected = np.flatnonzero((table.salary_from <= 60000) & (table.salary_to >= 40000)).tolist()
+        self.assertEqual(index.lookup_salaries(40000, 60000).tolist(), expected)
+        self.assertEqual(index.lookup_salaries(60000, 40000).tolist(), expected)
+
+    def test_parse_filter(self):
+        self.assertEqual(parse_filter("Название региона: Москва"), [[["Название региона", "Москва"]]])
+        self.assertEqual(parse_filter("Оклад: 10000 - 20000 && Премиум-вакансия: Да || Компания: Enface"),
+                         [[["Оклад", "10000 - 20000"], ["Премиум-вакансия", "Да"]], [["Компания", "Enface"]]])
+        self.assertEqual(parse_filter("Название: "), [[["Название", ""]]])
+        self.assertEqual(parse_filter("Компания: A&&B || Компания: Johnson && Johnson && Название региона: Москва"),
+                         [[["Компания", "A&&B"]], [["Компания", "Johnson && Johnson"], ["Название региона", "Москва"]]])
+
+    def test_dataset_filter_expression(self):
+        dataset = DataSet("vacancies_big.csv")
+        vacancies = list(dataset.vacancies_objects)
+
+        def check_expression(expression: str, check):
+            rows = dataset.index.filter(parse_filter(expression))
+            self.assertEqual(rows.tolist(), [i for i, vacancy in enumerate(vacancies) if check(vacancy)])
+
+        check_expression("Оклад: 40000 - 60000",
+                         lambda v: v.salary.salary_from <= 60000 and 40000 <= v.salary.salary_to)
+        check_expression("Дата публикации вакансии: 01.07.2022 - 10.07.2022",
+                         lambda v: datetime(2022, 7, 1).date() <= v.published_at.date() <= datetime(2022, 7, 10).date())
+        check_expression("Название региона: Москва && Премиум-вакансия: Да || Идентификатор валюты оклада: Доллары",
+                         lambda v: v.area_name == "Москва" and v.premium == "Да" or
+                                   v.salary.salary_currency == "Доллары")
+        rows = dataset.get_rows(True, parse_filter("Название региона: Москва && Оклад: 50000"))
+        self.assertTrue(all(row[8] == "Москва" for row in rows))
+
     def test_dataset_sort(self):
         def check_sort(sort_params: str):
             dataset.sort(sort_params)
@@ -34,6 +254,46 @@ class DataSetTests(TestCase):
         check_sort("Дата публикации вакансии")
         check_sort("Оклад")
 
+    def test_top_k_argsort(self):
+        keys = np.random.default_rng(1).integers(0, 20, 500)
+        for k in [0, 1, 7, 100, 500, 600]:
+            for is_sort_reverse in [False, True]:
+                expected = stable_argsort(keys, is_sort_reverse)[:k].tolist()
+                self.assertEqual(top_k_argsort(keys, k, is_sort_reverse).tolist(), expected)
+                self.assertEqual(top_k_argsort(keys.astype(str).astype(object), k, is_sort_reverse).tolist(),
+                                 stable_argsort(keys.astype(str), is_sort_reverse)[:k].tolist())
+
+    def test_dataset_get_rows_window(self):
+        dataset = DataSet("vacancies_big.csv")
+        for sort_params in ["Оклад", "Название", "Премиум-вакансия"]:
+            full = dataset.get_rows(True, ["Название региона", "Москва"], sort_params, True)
+            self.assertEqual(dataset.get_rows(True, ["Название региона", "Москва"], sort_params, True, 3, 15),
+                             full[3:15])
+        dataset.sort("Дата публикации вакансии")
+        self.assertEqual(dataset.get_rows(False, "", None, False, 10, 20), dataset.get_rows(False, "")[10:20])
+
+    def test_dataset_multi_sort(self):
+        dataset = DataSet("vacancies_big.csv")
+        region = functions_for_sort["Название региона"](dataset.table)
+        salary = functions_for_sort["Оклад"](dataset.table)
+        expected = sorted(range(len(region)), key=lambda i: (region[i], -salary[i]))
+        dataset.sort("Название региона, -Оклад")
+        self.assertEqual(dataset.order.tolist(), expected)
+        expected = sorted(range(len(region)), key=lambda i: (region[i], -salary[i]), reverse=True)
+        dataset.sort("Название региона, -Оклад", True)
+        self.assertEqual(dataset.order.tolist(), expected)
+
+    def test_dataset_cached_sort(self):
+        dataset = DataSet("vacancies_big.csv")
+        order = list(range(len(dataset.table)))
+        for sort_params in functions_for_sort:
+            keys = functions_for_sort[sort_params](dataset.table)
+            for is_sort_reverse in [False, True, True, False]:
+                order = sorted(order, key=lambda i: keys[i], reverse=is_sort_reverse)
+                dataset.sort(sort_params, is_sort_reverse)
+                self.assertEqual(dataset.order.tolist(), order)
+        self.assertEqual(len(dataset.sort_keys), len(functions_for_sort))
+
     def test_dataset_filter(self):
         functions_for_checking = {
             "Название": lambda vacancy, value: vacancy[1] == value,
@@ -60,6 +320,112 @@ class DataSetTests(TestCase):
         check_filter("Дата публикации вакансии", "06.07.2022")
 
 
+class TableWriterTests(TestCase):
+    def test_table_writer_matches_prettytable(self):
+        rows = DataSet("vacancies_big.csv").get_rows(False, "", "Навыки", True, 0, 50)
+        for fields in [headings, ['№', 'Название', 'Оклад', 'Дата публикации вакансии']]:
+            table = prettytable.PrettyTable(border=True, header=True, hrules=prettytable.ALL)
+            table.field_names = headings
+            table.add_rows([list(row) for row in rows])
+            table.align = "l"
+            table.max_width = 20
+            output = io.StringIO()
+            TableWriter(headings).write(iter(rows), fields, output)
+            self.assertEqual(output.getvalue(), table.get_string(fields=fields) + "\n")
+
+    def test_table_writer_sample(self):
+        rows = DataSet("vacancies_big.csv").get_rows(False, "", None, False, 0, 300)
+        output = io.StringIO()
+        TableWriter(headings, sample_size=5).write(iter(rows), headings, output)
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(set(len(line) for line in lines)), 1)
+        self.assertEqual(sum(line.startswith('+') for line in lines), 302)
+
+
+class TableOfDataSetTests(TestCase):
+    def test_table_of_dataset_params(self):
+        dataset = DataSet("vacancies_big.csv")
+        output = io.StringIO()
+        TableOfDataSet({"filter": "Название региона: Москва", "sort": "Оклад", "reverse": "Да", "range": "2 4",
+                        "fields": "Название, Оклад"}, dataset, output)
+        expected = io.StringIO()
+        TableWriter(headings).write(dataset.get_rows(True, ["Название региона", "Москва"], "Оклад", True, 1, 3),
+                                    ['Название', 'Оклад', '№'], expected)
+        self.assertEqual(output.getvalue(), expected.getvalue())
+
+    def test_run_job_table(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        dataset = DataSet("vacancies_big.csv")
+        run_job(dataset, {"range": "1 3", "fields": "Название", "output": directory})
+        with open(os.path.join(directory, "table.txt"), encoding='utf-8') as file:
+            self.assertEqual(file.read().count("\n| 2 |"), 1)
+
+    def test_run_job_rejected_table(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        with self.assertRaises(SystemExit):
+            run_job(DataSet("vacancies_big.csv"), {"sort": "Зарплата", "output": os.path.join(directory, "out")})
+        self.assertFalse(os.path.exists(os.path.join(directory, "out")))
+
+    def test_run_job_rejected_format(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        with self.assertRaises(ValueError):
+            run_job(DataSet("vacancies_big.csv"), {"job_name": "Программист", "formats": ["svg"],
+                                                   "output": os.path.join(directory, "out")})
+        self.assertFalse(os.path.exists(os.path.join(directory, "out")))
+
+    def test_analyze_prints_selected_job(self):
+        dataset = DataSet("vacancies_big.csv")
+        dataset.fill_analyze_set(["Программист", "Аналитик"])
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            dataset.analyze("Аналитик")
+        self.assertEqual(len(stdout.getvalue().splitlines()), 6)
+
+    def test_batch_skips_failed_jobs(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        jobs = os.path.join(directory, "jobs.jsonl")
+        with open(jobs, 'w', encoding='utf-8') as file:
+            file.write(json.dumps({"range": "a b", "output": os.path.join(directory, "bad")}) + "\n")
+            file.write(json.dumps({"range": "1 3", "output": os.path.join(directory, "good")}) + "\n")
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            main_batch(["vacancies_big.csv", jobs, "--processes", "1", "--no-cache"])
+        self.assertIn("Задание 1 не выполнено", stderr.getvalue())
+        self.assertFalse(os.path.exists(os.path.join(directory, "bad", "table.txt")))
+        self.assertTrue(os.path.exists(os.path.join(directory, "good", "table.txt")))
+
+
+class VacancyTests(TestCase):
+    def test_vacancy_lazy_fields(self):
+        vacancy = Vacancy({"name": "Аналитик", "description": "Описание", "key_skills": "SQL;;Python",
+                           "experience_id": "noExperience", "premium": "False", "employer_name": "Enface",
+                           "salary_from": "10", "salary_to": "20", "salary_gross": "True", "salary_currency": "RUR",
+                           "area_name": "Москва", "published_at": "2022-07-05T18:19:30+0300"})
+        self.assertFalse(hasattr(vacancy, "__dict__"))
+        self.assertIsInstance(vacancy._published_at, str)
+        self.assertIsInstance(vacancy._key_skills, str)
+        self.assertEqual(vacancy.published_at, datetime.strptime("2022-07-05T18:19:30+0300", '%Y-%m-%dT%H:%M:%S%z'))
+        self.assertIs(vacancy.published_at, vacancy.published_at)
+        self.assertEqual(vacancy.key_skills, ["SQL", "Python"])
+        self.assertEqual(vacancy.experience_id, "Нет опыта")
+        self.assertEqual(vacancy.premium, "Нет")
+
+    def test_parse_published_at(self):
+        for s in ["2022-07-05T18:19:30+0300", "2007-12-31T23:59:59-0130", "2019-01-01T00:00:00+0000"]:
+            parsed = parse_published_at(s)
+            expected = datetime.strptime(s, '%Y-%m-%dT%H:%M:%S%z')
+            self.assertEqual(parsed, expected)
+            self.assertEqual(parsed.utcoffset(), expected.utcoffset())
+            self.assertEqual(parsed.strftime("%d.%m.%Y"), expected.strftime("%d.%m.%Y"))
+        self.assertIs(parse_published_at("2022-07-05T18:19:30+0300"), parse_published_at("2022-07-05T18:19:30+0300"))
+        with self.assertRaises(ValueError):
+            parse_published_at("2022-13-05T18:19:30+0300")
+
+
 class SalaryTests(TestCase):
     def test_salary_init(self):
         salary = Salary([10.0, 20.4, 'RUR'])
@@ -87,3 +453,171 @@ class SalaryTests(TestCase):
 
     def test_salary_to_string(self):
         self.assertEqual(Salary(['10.0', '20000', 'USD']).to_string(), '10 - 20 000 (Доллары) (Без вычета налогов)')
+
+
+class SeparatorTests(TestCase):
+    def test_separate_file_by_year(self):
+        name = write_temp_csv('name,published_at\n"a\nb",2020-01-01T00:00:00+0300\n'
+                              'c,2019-05-05T00:00:00+0300\n"d, e",2020-02-02T00:00:00+0300\n')
+        for processes in (1, 2):
+            directory = tempfile.mkdtemp()
+            Separator.separate_file_by_year_by_year(name, processes, directory)
+            self.assertEqual(sorted(os.listdir(directory)), ['manifest.json', 'vacancies_by_2019.csv',
+                                                             'vacancies_by_2020.csv'])
+            with open(os.path.join(directory, 'vacancies_by_2020.csv'), encoding='utf-8', newline='') as file:
+                self.assertEqual(list(csv.reader(file)), [['name', 'published_at'],
+                                                          ['a\nb', '2020-01-01T00:00:00+0300'],
+                                                          ['d, e', '2020-02-02T00:00:00+0300']])
+            shutil.rmtree(directory)
+        os.remove(name)
+
+    def test_separate_skips_bad_rows_and_old_files(self):
+        name = write_temp_csv('name,published_at\nа,2020-01-01T00:00:00+0300\nб\nв,\n')
+        directory = tempfile.mkdtemp()
+        open(os.path.join(directory, 'vacancies_by_1999.csv'), 'w').close()
+        Separator.separate_file_by_year_by_year(name, 1, directory)
+        self.assertEqual(sorted(os.listdir(directory)), ['manifest.json', 'vacancies_by_2020.csv'])
+        with open(os.path.join(directory, 'vacancies_by_2020.csv'), encoding='utf-8', newline='') as file:
+            self.assertEqual(list(csv.reader(file)), [['name', 'published_at'], ['а', '2020-01-01T00:00:00+0300']])
+        shutil.rmtree(directory)
+        os.remove(name)
+
+    def test_columnar_year_analyze(self):
+        name = write_temp_csv('name,salary_from,salary_to,salary_currency,area_name,published_at\n'
+                              'Программист,100,200,RUR,Москва,2020-01-01T00:00:00+0300\n'
+                              'Аналитик,10,20,USD,Казань,2020-02-01T00:00:00+0300\n'
+                              'Программист,,200,RUR,Москва,2020-03-01T00:00:00+0300\n'
+                              'Старший программист,300,500,EUR,Москва,2021-01-01T00:00:00+0300\n')
+        csv_directory, npz_directory = tempfile.mkdtemp(), tempfile.mkdtemp()
+        Separator.separate_file_by_year_by_year(name, 1, csv_directory)
+        Separator.separate_file_by_year_by_year(name, 1, npz_directory, columnar=True)
+        self.assertEqual(sorted(os.listdir(npz_directory)), ['manifest.json', 'vacancies_by_2020.npz',
+                                                             'vacancies_by_2021.npz'])
+        for year in ('2020', '2021'):
+            self.assertEqual(year_analyze(os.path.join(npz_directory, f'vacancies_by_{year}.npz'), 'рограммист'),
+                             year_analyze(os.path.join(csv_directory, f'vacancies_by_{year}.csv'), 'рограммист'))
+        shutil.rmtree(csv_directory)
+        shutil.rmtree(npz_directory)
+        os.remove(name)
+
+    def test_manifest(self):
+        name = write_temp_csv('name,salary_from,salary_to,salary_currency,area_name,published_at\n'
+                              'Программист,100,200,RUR,Москва,2020-01-01T00:00:00+0300\n'
+                              'Аналитик,10,20,USD,Казань,2020-02-01T00:00:00+0300\n'
+                              'Программист,,200,RUR,Москва,2020-03-01T00:00:00+0300\n'
+                              'Старший программист,300,500,EUR,Москва,2021-01-01T00:00:00+0300\n')
+        directory = tempfile.mkdtemp()
+        Separator.separate_file_by_year_by_year(name, 1, directory)
+        data_set = PartitionedDataSet(directory)
+        manifest = data_set.read_manifest()
+        self.assertEqual(manifest['vacancies_by_2020.csv']['rows'], 2)
+        self.assertEqual(manifest['vacancies_by_2020.csv']['areas'], ['Казань', 'Москва'])
+        self.assertEqual(manifest['vacancies_by_2020.csv']['max_published_at'], '2020-02-01T00:00:00+0300')
+        self.assertEqual(data_set.partition_files((2021, 2022)), [f'{directory}/vacancies_by_2021.csv'])
+        self.assertEqual(data_set.partition_files(area_name='Казань'), [f'{directory}/vacancies_by_2020.csv'])
+        self.assertTrue(data_set.analyze_manifest(area_name='Москва'))
+        self.assertEqual(data_set.number_by_years, {2020: 1, 2021: 1})
+        self.assertEqual(data_set.salary_by_years, {2020: 150, 2021: 23960})
+        with open(f'{directory}/vacancies_by_2021.csv', 'a', encoding='utf-8') as file:
+            file.write('Тестировщик,1,2,RUR,Омск,2021-02-01T00:00:00+0300\n')
+        self.assertNotIn('vacancies_by_2021.csv', data_set.read_manifest())
+        self.assertFalse(PartitionedDataSet(directory).analyze_manifest())
+        shutil.rmtree(directory)
+        os.remove(name)
+
+    def test_incremental_separate(self):
+        text = 'name,salary_from,salary_to,salary_currency,area_name,published_at\n' \
+               'Программист,100,200,RUR,Москва,2020-01-01T00:00:00+0300\n' \
+               'Аналитик,10,20,USD,Казань,2021-02-01T00:00:00+0300\n'
+        name = write_temp_csv(text + 'Тестировщик,1,2,RUR,Омск,2022-01-01T00:00:00+0300\n')
+        directory = tempfile.mkdtemp()
+        Separator.separate_file_by_year_by_year(name, 1, directory, incremental=True)
+        paths = {year: os.path.join(directory, f'vacancies_by_{year}.csv') for year in (2020, 2021, 2022)}
+        for path in paths.values():
+            os.utime(path, ns=(1, 1))
+        Separator.write_manifest(directory, {os.path.basename(path): {
+            **Separator.read_manifest(directory)[os.path.basename(path)], 'size': os.path.getsize(path),
+            'mtime_ns': 1} for path in paths.values()})
+        with open(name, 'w', encoding='utf-8') as file:
+            file.write(text.replace('Аналитик', 'Старший аналитик'))
+        Separator.separate_file_by_year_by_year(name, 1, directory, incremental=True)
+        self.assertEqual(os.stat(paths[2020]).st_mtime_ns, 1)
+        self.assertNotEqual(os.stat(paths[2021]).st_mtime_ns, 1)
+        self.assertFalse(os.path.exists(paths[2022]))
+        self.assertEqual(sorted(os.listdir(directory)), ['manifest.json', 'vacancies_by_2020.csv',
+                                                         'vacancies_by_2021.csv'])
+        self.assertEqual(PartitionedDataSet(directory).read_manifest().keys(),
+                         {'vacancies_by_2020.csv', 'vacancies_by_2021.csv'})
+        shutil.rmtree(directory)
+        os.remove(name)
+
+    def test_load_vacancies_to_shared_memory(self):
+        name = write_temp_csv('name,salary_from,salary_to,salary_currency,area_name,published_at\n'
+                              'Программист,100,200,RUR,Москва,2020-01-01T00:00:00+0300\n'
+                              'Аналитик,10,20,USD,Казань,2021-02-01T00:00:00+0300\n'
+                              'Программист,,200,RUR,Москва,2021-03-01T00:00:00+0300\n'
+                              'Программист,300,500,EUR,Москва,2021-01-01T00:00:00+0300\n')
+        directory = tempfile.mkdtemp()
+        Separator.separate_file_by_year_by_year(name, 1, directory)
+        for has_manifest in (True, False):
+            if not has_manifest:
+                os.remove(os.path.join(directory, 'manifest.json'))
+            data_set = PartitionedDataSet(directory)
+            data_set.load_vacancies()
+            self.assertEqual(data_set.vacancies_number, 3)
+            self.assertEqual([vacancy.name for vacancy in data_set.vacancies_objects],
+                             ['Программист', 'Аналитик', 'Программист'])
+            self.assertEqual(data_set.vacancies_table.dictionaries['area_name'], ['Москва', 'Казань'])
+            self.assertEqual(data_set.vacancies_table.row_dict(2)['published_at'], '2021-01-01T00:00:00+0300')
+            data_set.sort('Оклад', True)
+            self.assertEqual([vacancy.salary.mid_salary_in_rubles for vacancy in data_set.vacancies_objects],
+                             [23960.0, 909.9, 150.0])
+            data_set.close()
+            self.assertIsNone(data_set.vacancies_table)
+        shutil.rmtree(directory)
+        os.remove(name)
+
+
+class PartitionedDataSetTests(TestCase):
+    def test_analyze_counts_vacancies_by_year(self):
+        directory = tempfile.mkdtemp()
+        header = 'name,salary_from,salary_to,salary_currency,area_name,published_at\n'
+        with open(os.path.join(directory, 'vacancies_by_2020.csv'), 'w', encoding='utf-8') as file:
+            file.write(header + 'Программист,100,200,RUR,Москва,2020-01-01T00:00:00+0300\n'
+                                'Аналитик,10,20,USD,Казань,2020-02-01T00:00:00+0300\n')
+        with open(os.path.join(directory, 'vacancies_by_2021.csv'), 'w', encoding='utf-8') as file:
+            file.write(header + 'Программист,300,500,EUR,Москва,2021-01-01T00:00:00+0300\n')
+        for data_set_class in (PartitionedDataSet, FuturesDataSet):
+            data_set = data_set_class(directory)
+            data_set.analyze('Программист')
+            self.assertEqual(data_set.number_by_years, {2020: 2, 2021: 1})
+            self.assertEqual(data_set.number_by_years_job, {2020: 1, 2021: 1})
+            self.assertEqual(data_set.salary_by_years, {2020: 529, 2021: 23960})
+            self.assertEqual(data_set.vacancies_number, 3)
+        shutil.rmtree(directory)
+
+    def test_load_full_vacancies_to_shared_memory(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        Separator.separate_file_by_year_by_year("vacancies_big.csv", 2, directory)
+        rows = [row for file in sorted(os.listdir(directory)) if file.endswith('.csv')
+                for row in PartitionedDataSet.file_to_rows(os.path.join(directory, file))]
+        with PartitionedDataSet(directory) as data_set:
+            data_set.load_vacancies()
+            self.assertTrue(data_set.vacancies_table.is_full)
+            self.assertEqual(data_set.vacancies_table.row_dict(7)['description'], rows[7]['description'])
+            self.assertEqual(data_set.vacancies_table.row_dict(7)['key_skills'], rows[7]['key_skills'])
+            self.assertEqual(data_set.get_rows(False, None)[:20],
+                             [PartitionedVacancy(row).get_row(i) for i, row in enumerate(rows[:20])])
+        self.assertIsNone(data_set.vacancies_table)
+        manifest_name = os.path.join(directory, 'manifest.json')
+        with open(manifest_name, encoding='utf-8') as file:
+            manifest = json.load(file)
+        for stats in manifest['partitions'].values():
+            stats['rows'] += 1
+        with open(manifest_name, 'w', encoding='utf-8') as file:
+            json.dump(manifest, file)
+        data_set = PartitionedDataSet(directory)
+        with self.assertRaises(ValueError):
+            data_set.load_vacancies()
+        self.assertIsNone(data_set.vacancies_table)
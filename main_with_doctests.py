@@ -1,9 +1,10 @@
 import csv
 import doctest
+import functools
 import re
 import matplotlib.pyplot as plt
 import numpy as np
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from openpyxl import Workbook
 from openpyxl.styles import Font, Border, Side
 from jinja2 import Environment, FileSystemLoader
@@ -25,6 +26,47 @@ def exp_for_num(s: str):
     return 0 if len(s) == 0 else int(s[0])
 
 
+@functools.lru_cache(maxsize=1 << 16)
+def parse_published_at(s: str):
+    """Быстро преобразует дату публикации формата 2022-07-05T18:19:30+0300 в datetime срезами строки, результат
+    запоминается, так как у многих вакансий дата совпадает. Строки другого формата разбираются через strptime
+
+    Args:
+        s (str): Дата публикации вакансии
+
+    Returns:
+        datetime: Дата с часовым поясом, такая же, как у datetime.strptime(s, '%Y-%m-%dT%H:%M:%S%z')
+
+    >>> parse_published_at('2022-07-05T18:19:30+0300')
+    datetime.datetime(2022, 7, 5, 18, 19, 30, tzinfo=datetime.timezone(datetime.timedelta(seconds=10800)))
+    >>> parse_published_at('2022-01-31T00:00:00-0130') == datetime.strptime('2022-01-31T00:00:00-0130',
+    ...                                                                       '%Y-%m-%dT%H:%M:%S%z')
+    True
+    """
+    if len(s) != 24 or s[4] != '-' or s[7] != '-' or s[10] != 'T' or s[13] != ':' or s[16] != ':' or \
+            s[19] not in '+-':
+        return datetime.strptime(s, '%Y-%m-%dT%H:%M:%S%z')
+    digits = s[:4] + s[5:7] + s[8:10] + s[11:13] + s[14:16] + s[17:19] + s[20:]
+    if not (digits.isascii() and digits.isdigit()):
+        return datetime.strptime(s, '%Y-%m-%dT%H:%M:%S%z')
+    return datetime(int(s[:4]), int(s[5:7]), int(s[8:10]), int(s[11:13]), int(s[14:16]), int(s[17:19]),
+                    tzinfo=time_zone(s[19:]))
+
+
+@functools.lru_cache(maxsize=None)
+def time_zone(s: str):
+    """Возвращает часовой пояс по смещению формата +0300, один объект на каждое смещение
+
+    Args:
+        s (str): Смещение относительно UTC
+
+    Returns:
+        timezone: Часовой пояс
+    """
+    offset = timedelta(hours=int(s[1:3]), minutes=int(s[3:5]))
+    return timezone(-offset if s[0] == '-' else offset)
+
+
 headings = ['№', 'Название', 'Описание', 'Навыки', 'Опыт работы', 'Премиум-вакансия', 'Компания',
             'Оклад', 'Название региона', 'Дата публикации вакансии']
 currency = {"AZN": "Манаты",
@@ -152,7 +194,7 @@ class Vacancy(object):
         self.salary = Salary(
             [vacancy['salary_from'], vacancy['salary_to'], vacancy['salary_currency']])
         self.area_name = vacancy['area_name']
-        self.published_at = datetime.strptime(vacancy['published_at'], '%Y-%m-%dT%H:%M:%S%z')
+        self.published_at = parse_published_at(vacancy['published_at'])
         self.year = int(self.published_at.strftime("%Y"))
         if len(vacancy) > 6:
             self.description = vacancy['description']
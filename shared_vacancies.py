@@ -0,0 +1,245 @@
+import csv
+import numpy as np
+from multiprocessing import shared_memory
+
+
+def file_to_rows(file_path: str):
+    """Извлекает данные из csv таблицы одного года и преобразует их в список словарей, подходящих для
+    преобразования в объект Vacancy, строки с пропусками отбрасываются
+    Args:
+        file_path (str): Название файла и путь к нему
+    Returns:
+        (list): Список словарей
+    """
+    with open(file_path, encoding='utf-8-sig') as r_file:
+        text = [x for x in csv.reader(r_file)]
+    if len(text) < 2:
+        print("Пустой файл" if len(text) < 1 else "Нет данных")
+        quit()
+    vacancy = text[0]
+    return [dict(zip(vacancy, x)) for x in text[1:] if len([value for value in x if value]) == len(vacancy)]
+
+
+class SharedVacancyTable(object):
+    """Колоночное хранилище вакансий в общей памяти: каждый столбец - массив numpy поверх блока
+    multiprocessing.shared_memory, который создаёт родительский процесс, а процессы-обработчики заполняют
+    своими частями. Повторяющиеся строки кодируются номерами в словаре значений, а строки произвольной длины
+    хранятся байтами utf-8 в общем блоке text, столбец такой строки - пары (начало, конец) в этом блоке
+    Attributes:
+        columns (dict): Массивы столбцов по названиям
+        text (np.ndarray): Байты строковых столбцов (uint8)
+        dictionaries (dict): Списки значений закодированных столбцов, номер значения в списке равен его коду
+        is_full (bool): Атрибут, указывающий, что в файлах есть полная информация о вакансиях
+        blocks (dict): Блоки общей памяти по названиям столбцов, байты строк - в блоке text
+    """
+    float_columns = ["salary_from", "salary_to"]
+    encoded_columns = ["name", "salary_currency", "area_name", "experience_id", "employer_name"]
+    bool_columns = ["premium", "salary_gross"]
+    string_columns = ["published_at", "description", "key_skills"]
+    full_columns = ["description", "key_skills", "experience_id", "premium", "employer_name", "salary_gross"]
+
+    def __init__(self, length: int, text_size: int, is_full: bool):
+        """Создаёт блоки общей памяти под столбцы нужной длины, при ошибке уже созданные блоки освобождаются
+        Args:
+            length (int): Количество вакансий
+            text_size (int): Размер блока для байтов строк
+            is_full (bool): Атрибут, указывающий, что в файлах есть полная информация о вакансиях
+        """
+        self.is_full = is_full
+        self.blocks = {}
+        self.columns = {}
+        self.text = None
+        self.dictionaries = {column: [] for column in self.encoded_columns if column in self.layout(is_full)}
+        try:
+            for column, (dtype, shape) in self.layout(is_full).items():
+                shape = (length,) + shape
+                self.blocks[column] = shared_memory.SharedMemory(
+                    create=True, size=max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1))
+                self.columns[column] = np.ndarray(shape, dtype, buffer=self.blocks[column].buf)
+            self.blocks["text"] = shared_memory.SharedMemory(create=True, size=max(text_size, 1))
+            self.text = np.ndarray((text_size,), np.uint8, buffer=self.blocks["text"].buf)
+        except BaseException:
+            self.close()
+            raise
+
+    @classmethod
+    def layout(cls, is_full: bool):
+        """Возвращает тип и форму одной строки каждого столбца
+        Args:
+            is_full (bool): Атрибут, указывающий, что в файлах есть полная информация о вакансиях
+        Returns:
+            (dict): Пары (тип, форма) по названиям столбцов
+        """
+        layout = {}
+        for columns, dtype, shape in [(cls.float_columns, np.float64, ()), (cls.encoded_columns, np.int32, ()),
+                                      (cls.bool_columns, np.bool_, ()), (cls.string_columns, np.int64, (2,))]:
+            for column in columns:
+                if is_full or column not in cls.full_columns:
+                    layout[column] = (dtype, shape)
+        return layout
+
+    def block_names(self):
+        """Возвращает имена блоков общей памяти, по которым процессы-обработчики подключаются к столбцам
+        Returns:
+            (dict): Имена блоков по названиям столбцов
+        """
+        return {column: block.name for column, block in self.blocks.items()}
+
+    def merge_dictionaries(self, start: int, end: int, dictionaries: dict):
+        """Переводит коды части столбцов, записанные процессом со своими словарями, в коды общих словарей
+        Args:
+            start (int): Первая строка части
+            end (int): Строка после последней строки части
+            dictionaries (dict): Словари значений процесса по названиям закодированных столбцов
+        """
+        for column in self.dictionaries:
+            codes = {value: i for i, value in enumerate(self.dictionaries[column])}
+            for value in dictionaries[column]:
+                if value not in codes:
+                    codes[value] = len(self.dictionaries[column])
+                    self.dictionaries[column].append(value)
+            mapping = np.array([codes[value] for value in dictionaries[column]] or [0], dtype=np.int32)
+            self.columns[column][start:end] = mapping[self.columns[column][start:end]]
+
+    def string(self, column: str, index: int):
+        """Возвращает значение строкового столбца
+        Args:
+            column (str): Название строкового столбца
+            index (int): Номер строки в таблице
+        Returns:
+            (str): Значение
+        """
+        start, end = self.columns[column][index]
+        return self.text[start:end].tobytes().decode('utf-8')
+
+    def row_dict(self, index: int):
+        """Собирает словарь одной строки файла, подходящий для преобразования в объект Vacancy
+        Args:
+            index (int): Номер строки в таблице
+        Returns:
+            (dict): Словарь с данными о вакансии
+        """
+        row = {}
+        for column in self.columns:
+            if column in self.dictionaries:
+                row[column] = self.dictionaries[column][self.columns[column][index]]
+            elif column in self.string_columns:
+                row[column] = self.string(column, index)
+            elif column in self.bool_columns:
+                row[column] = str(bool(self.columns[column][index]))
+            else:
+                row[column] = float(self.columns[column][index])
+        return row
+
+    def __len__(self):
+        return len(self.columns["salary_from"])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Освобождает блоки общей памяти, после этого столбцы таблицы использовать нельзя. Повторный вызов ничего
+        не делает
+        """
+        self.columns = {}
+        self.text = None
+        for block in self.blocks.values():
+            block.close()
+            block.unlink()
+        self.blocks = {}
+
+
+class VacancyView(object):
+    """Ленивое представление строк SharedVacancyTable в виде объектов Vacancy, которые создаются только при обращении
+    Attributes:
+        table (SharedVacancyTable): Таблица вакансий
+        vacancy_class (type): Класс вакансии скрипта, принимающий словарь строки файла
+    """
+
+    def __init__(self, table: SharedVacancyTable, vacancy_class: type):
+        """Инициализирует объект VacancyView
+        Args:
+            table (SharedVacancyTable): Таблица вакансий
+            vacancy_class (type): Класс вакансии скрипта, принимающий словарь строки файла
+        """
+        self.table = table
+        self.vacancy_class = vacancy_class
+
+    def __len__(self):
+        return len(self.table)
+
+    def __getitem__(self, item):
+        return self.vacancy_class(self.table.row_dict(item))
+
+    def __iter__(self):
+        return (self.vacancy_class(self.table.row_dict(i)) for i in range(len(self.table)))
+
+
+def count_vacancies(file_path: str):
+    """Считает вакансии в файле одного года так же, как их отбирает file_to_rows, нужна, когда в манифесте
+    нет количества строк файла
+
+    Args:
+        file_path (str): Название файла и путь к нему
+
+    Returns:
+        (int): Количество вакансий
+    """
+    return len(file_to_rows(file_path))
+
+
+def year_columns(file_path: str, block_names: dict, is_full: bool, start: int, length: int, text_start: int,
+                 text_size: int):
+    """Разбирает файл одного года и записывает его столбцы прямо в блоки общей памяти родительского процесса,
+    начиная со строки start, а байты строк - в часть блока text, начиная с text_start. Строки файла - часть его
+    содержимого, поэтому размера файла для них всегда хватает. Назад передаются только небольшие словари
+    различных значений, а не объекты Vacancy
+
+    Args:
+        file_path (str): Название файла и путь к нему
+        block_names (dict): Имена блоков общей памяти по названиям столбцов
+        is_full (bool): Атрибут, указывающий, что в файлах есть полная информация о вакансиях
+        start (int): Первая строка файла в общих столбцах
+        length (int): Количество вакансий в файле по манифесту
+        text_start (int): Начало части блока text для байтов строк файла
+        text_size (int): Размер части блока text, размер файла
+
+    Returns:
+        (dict): Словари значений закодированных столбцов, номер значения в списке равен его коду
+    """
+    vacancies = file_to_rows(file_path)
+    if len(vacancies) != length:
+        raise ValueError(f"В файле {file_path} {len(vacancies)} вакансий, а в манифесте {length}")
+    dictionaries = {}
+    blocks = {}
+    try:
+        for column, (dtype, shape) in SharedVacancyTable.layout(is_full).items():
+            blocks[column] = shared_memory.SharedMemory(block_names[column])
+            view = np.ndarray((length,) + shape, dtype, buffer=blocks[column].buf,
+                              offset=start * int(np.prod(shape)) * np.dtype(dtype).itemsize)
+            if column in SharedVacancyTable.encoded_columns:
+                codes = dictionaries[column] = {}
+                view[:] = [codes.setdefault(x[column], len(codes)) for x in vacancies]
+            elif column in SharedVacancyTable.string_columns:
+                blocks.setdefault("text", shared_memory.SharedMemory(block_names["text"]))
+                position = text_start
+                for i, x in enumerate(vacancies):
+                    data = x[column].encode('utf-8')
+                    if position + len(data) > text_start + text_size:
+                        raise ValueError(f"Строки файла {file_path} не помещаются в отведённую память")
+                    blocks["text"].buf[position:position + len(data)] = data
+                    view[i] = (position, position + len(data))
+                    position += len(data)
+                text_start, text_size = position, text_size - (position - text_start)
+            elif column in SharedVacancyTable.bool_columns:
+                view[:] = [x[column] == "True" for x in vacancies]
+            else:
+                view[:] = [float(x[column]) for x in vacancies]
+            del view
+    finally:
+        for block in blocks.values():
+            block.close()
+    return {column: list(codes) for column, codes in dictionaries.items()}